@@ -0,0 +1,86 @@
+"""
+In-process LRU cache with per-entry TTL for calendar reads.
+
+Writers call `invalidate` for the keys they touched. Readers capture
+`generation` before going to MongoDB and pass it back to `set`, so a read that
+raced with a write to the same key never repopulates the cache with the
+pre-write value. Reads of other keys are unaffected: each invalidation is
+remembered per key for one TTL (at most maxsize of them), and a read older
+than the invalidations forgotten since is conservatively not stored.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # key -> (generation, time) of its last invalidation, oldest first
+        self._invalidated: "OrderedDict[Hashable, Tuple[int, float]]" = OrderedDict()
+        # Reads that started before this generation may have missed a forgotten invalidation
+        self._floor = 0
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Store value unless the key was invalidated since `generation` was read"""
+        if self.maxsize <= 0:
+            return
+        if generation is not None and (
+            generation < self._floor or self._invalidated.get(key, (0, 0.0))[0] > generation
+        ):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self.generation += 1
+        self._entries.pop(key, None)
+        now = time.monotonic()
+        self._invalidated[key] = (self.generation, now)
+        self._invalidated.move_to_end(key)
+        while self._invalidated:
+            generation, invalidated_at = next(iter(self._invalidated.values()))
+            if invalidated_at >= now - self.ttl and len(self._invalidated) <= self.maxsize:
+                break
+            self._invalidated.popitem(last=False)
+            self._floor = max(self._floor, generation)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._floor = self.generation
+        self._invalidated.clear()
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,135 @@
+"""
+Day-level change notifications for connected clients.
+
+`ChangeHub` is an in-process pub/sub keyed by user: the WebSocket and SSE
+endpoints subscribe, and every committed day write publishes one small event
+
+    {"type": "day_changed" | "day_deleted", "date": "2025-08-15",
+     "year": 2025, "month": 8, "day": 15, "etag": "\"<_id>-<version>\""}
+
+Events only say which day changed; clients refetch it (or compare the ETag
+with the one they hold) and use the changes feed to catch up after a
+reconnect. A subscriber that falls more than its queue size behind has its
+backlog replaced by a single {"type": "resync"} event.
+
+With one worker, the write paths publish directly. With several, set
+CALENDAR_PUSH_SOURCE=change_stream: `follow_change_stream` then tails a
+MongoDB change stream on calendar_data and calendar_tombstones, so every
+worker sees every write, whichever worker made it.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+CALENDAR_COLLECTION = "calendar_data"
+TOMBSTONES_COLLECTION = "calendar_tombstones"
+SUBSCRIBER_QUEUE_SIZE = 100
+RESYNC_EVENT = {"type": "resync"}
+CHANGE_STREAM_RETRY_SECONDS = 5
+
+
+class ChangeHub:
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.published = 0
+        self.dropped = 0
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Queue receiving the user's events for as long as the context is open"""
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def publish(self, user_id: str, event: Dict[str, Any]) -> None:
+        """Hand an event to every subscriber of the user without waiting on any of them"""
+        for queue in self._subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind to be worth replaying; the client refetches instead
+                self.dropped += queue.qsize()
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_EVENT)
+        self.published += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "users": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+# Only what is needed to name the day and build its ETag crosses the wire
+CHANGE_STREAM_PIPELINE = [
+    {"$match": {
+        "$or": [
+            {"ns.coll": CALENDAR_COLLECTION, "operationType": {"$in": ["insert", "update", "replace"]}},
+            {"ns.coll": TOMBSTONES_COLLECTION, "operationType": "insert"},
+        ]
+    }},
+    {"$project": {
+        "ns": 1,
+        "fullDocument._id": 1,
+        "fullDocument.user_id": 1,
+        "fullDocument.year": 1,
+        "fullDocument.month": 1,
+        "fullDocument.date": 1,
+        "fullDocument.version": 1,
+        # Days stored from a template and not written since take their ETag from it
+        "fullDocument.template": 1,
+    }},
+]
+
+DayCallback = Callable[[str, int, int, int, Optional[Dict[str, Any]]], Awaitable[None]]
+
+
+async def follow_change_stream(db, on_day: DayCallback) -> None:
+    """
+    Call on_day(user_id, year, month, date, doc) for every day written by any
+    worker, with doc None for deletions. Runs until cancelled, resuming after
+    the last event seen when the stream drops.
+    """
+    resume_token = None
+    while True:
+        try:
+            async with db.watch(
+                CHANGE_STREAM_PIPELINE,
+                full_document="updateLookup",
+                resume_after=resume_token
+            ) as stream:
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    doc = change.get("fullDocument")
+                    if not doc:
+                        # Updated, then deleted before the lookup; the tombstone follows
+                        continue
+                    deleted = change["ns"]["coll"] == TOMBSTONES_COLLECTION
+                    try:
+                        await on_day(
+                            doc["user_id"], doc["year"], doc["month"], doc["date"],
+                            None if deleted else doc
+                        )
+                    except Exception as e:
+                        print(f"Could not publish change for {doc.get('user_id')}: {e}")
+        except asyncio.CancelledError:
+            raise
+        except PyMongoError as e:
+            if isinstance(e, OperationFailure):
+                # Resume point no longer in the oplog; start again from now
+                resume_token = None
+            print(f"Change stream interrupted, retrying in {CHANGE_STREAM_RETRY_SECONDS}s: {e}")
+            await asyncio.sleep(CHANGE_STREAM_RETRY_SECONDS)
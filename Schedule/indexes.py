@@ -0,0 +1,273 @@
+"""
+Index declarations for the calendar and authentication collections.
+
+`ensure_indexes` is called from `connect_to_mongo` on startup and reconciles the
+declared indexes with what exists on the server. The module can also be run as
+a CLI to inspect index usage:
+
+    python -m Schedule.indexes sync     # create / repair declared indexes
+    python -m Schedule.indexes report   # usage stats and missing-index warnings
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+load_dotenv()
+
+CALENDAR_COLLECTION = "calendar_data"
+USERS_COLLECTION = "users"
+OTP_COLLECTION = "otp_verification"
+STATS_COLLECTION = "calendar_month_stats"
+TASKS_COLLECTION = "tasks"
+TASKS_DIRTY_COLLECTION = "tasks_dirty"
+TOMBSTONES_COLLECTION = "calendar_tombstones"
+BINDINGS_COLLECTION = "calendar_template_bindings"
+
+# How long deletions are remembered for delta sync; older sync tokens must resync from scratch
+TOMBSTONE_RETENTION_SECONDS = int(os.getenv("CALENDAR_TOMBSTONE_DAYS", "90")) * 24 * 3600
+# Expired OTPs stay this long after expires_at: the record also holds the pending
+# registration, and resend-otp needs it to issue a fresh code
+OTP_RETENTION_SECONDS = int(os.getenv("OTP_RETENTION_DAYS", "7")) * 24 * 3600
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    CALENDAR_COLLECTION: [
+        IndexModel(
+            [("user_id", ASCENDING), ("year", ASCENDING), ("month", ASCENDING), ("date", ASCENDING)],
+            name="user_day_unique",
+            unique=True,
+        ),
+        IndexModel([("user_id", ASCENDING), ("day_key", ASCENDING)], name="user_day_key"),
+        IndexModel([("user_id", ASCENDING), ("slots.task.status", ASCENDING)], name="user_task_status"),
+        IndexModel([("user_id", ASCENDING), ("slots.task.priority", ASCENDING)], name="user_task_priority"),
+        IndexModel([("user_id", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)], name="user_updated_at"),
+    ],
+    BINDINGS_COLLECTION: [
+        IndexModel([("user_id", ASCENDING), ("start_key", ASCENDING)], name="user_start_key"),
+    ],
+    TOMBSTONES_COLLECTION: [
+        IndexModel([("user_id", ASCENDING), ("deleted_at", ASCENDING), ("_id", ASCENDING)], name="user_deleted_at"),
+        IndexModel([("deleted_at", ASCENDING)], name="deleted_at_ttl", expireAfterSeconds=TOMBSTONE_RETENTION_SECONDS),
+    ],
+    STATS_COLLECTION: [
+        IndexModel(
+            [("user_id", ASCENDING), ("year", ASCENDING), ("month", ASCENDING)],
+            name="user_month_unique",
+            unique=True,
+        ),
+    ],
+    TASKS_DIRTY_COLLECTION: [
+        IndexModel([("user_id", ASCENDING), ("day_key", ASCENDING)], name="user_day_unique", unique=True),
+    ],
+    TASKS_COLLECTION: [
+        IndexModel([("user_id", ASCENDING), ("task_id", ASCENDING)], name="user_task_id"),
+        IndexModel(
+            [("user_id", ASCENDING), ("day_key", ASCENDING), ("slot_index", ASCENDING)],
+            name="user_day_slot",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("day_key", ASCENDING), ("slot_index", ASCENDING)],
+            name="user_status_day",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("priority", ASCENDING), ("day_key", ASCENDING), ("slot_index", ASCENDING)],
+            name="user_priority_day",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("title", TEXT), ("description", TEXT)],
+            name="user_task_text",
+            weights={"title": 10, "description": 2},
+        ),
+    ],
+    USERS_COLLECTION: [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    OTP_COLLECTION: [
+        IndexModel([("email", ASCENDING)], name="email_lookup"),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=OTP_RETENTION_SECONDS),
+    ],
+}
+
+# Indexes the API refuses to start without (see require_indexes)
+REQUIRED_INDEXES: Dict[str, List[str]] = {
+    CALENDAR_COLLECTION: ["user_day_unique"],
+}
+
+# Representative filters for the hot paths, used by the report to detect collection scans
+HOT_QUERIES: List[Tuple[str, str, Dict[str, Any]]] = [
+    ("get_calendar_document", CALENDAR_COLLECTION, {"user_id": "u", "year": 2025, "month": 8, "date": 15}),
+    ("get_month_calendar", CALENDAR_COLLECTION, {"user_id": "u", "year": 2025, "month": 8}),
+    ("get_user_calendar", CALENDAR_COLLECTION, {"user_id": "u"}),
+    ("get_range_calendar", CALENDAR_COLLECTION, {"user_id": "u", "day_key": {"$gte": 20250828, "$lte": 20250910}}),
+    ("get_calendar_documents", CALENDAR_COLLECTION, {"$or": [
+        {"user_id": "u", "year": 2025, "month": 8, "date": 15},
+        {"user_id": "v", "year": 2025, "month": 9, "date": 1}
+    ]}),
+    ("search_tasks", CALENDAR_COLLECTION, {"user_id": "u", "slots": {"$elemMatch": {"task.status": "pending"}}}),
+    ("get_changes", CALENDAR_COLLECTION, {"user_id": "u", "updated_at": {"$gt": datetime(2025, 8, 1)}}),
+    ("get_changes", TOMBSTONES_COLLECTION, {"user_id": "u", "deleted_at": {"$gt": datetime(2025, 8, 1)}}),
+    ("get_template_bindings", BINDINGS_COLLECTION, {"user_id": "u"}),
+    ("get_month_stats", STATS_COLLECTION, {"user_id": "u", "year": 2025, "month": 8}),
+    ("search_task_documents", TASKS_COLLECTION, {"user_id": "u", "status": "pending"}),
+    ("get_task", TASKS_COLLECTION, {"user_id": "u", "task_id": "task_001"}),
+    ("login", USERS_COLLECTION, {"email": "user@example.com"}),
+    ("verify_otp", OTP_COLLECTION, {"email": "user@example.com", "otp": "000000"}),
+]
+
+# Index options that must match for an existing index to count as the declared one
+COMPARED_OPTIONS = ("unique", "expireAfterSeconds", "partialFilterExpression", "sparse")
+
+
+def _index_key(index: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """
+    Index key as declared. The server reports text indexes with their text
+    fields folded into _fts/_ftsx and listed in weights instead.
+    """
+    key = [tuple(k) for k in (index["key"].items() if isinstance(index["key"], dict) else index["key"])]
+    if ("_fts", TEXT) in key:
+        return sorted((field, direction) for field, direction in key if field not in ("_fts", "_ftsx"))
+    if any(direction == TEXT for _, direction in key):
+        return sorted((field, direction) for field, direction in key if direction != TEXT)
+    return key
+
+
+def _index_matches(existing: Dict[str, Any], declared: Dict[str, Any]) -> bool:
+    if _index_key(existing) != _index_key(declared):
+        return False
+    if declared.get("weights") and existing.get("weights") != declared["weights"]:
+        return False
+    for option in COMPARED_OPTIONS:
+        if existing.get(option) != declared.get(option):
+            return False
+    return True
+
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create missing indexes and rebuild ones whose definition drifted.
+    Returns the names of created indexes per collection. Indexes that are not
+    declared here are left alone.
+    """
+    created: Dict[str, List[str]] = {}
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        for model in models:
+            declared = model.document
+            name = declared["name"]
+
+            if name in existing and _index_matches(existing[name], declared):
+                continue
+            if any(_index_matches(info, declared) for info in existing.values()):
+                # Same definition already present under another name
+                continue
+
+            try:
+                if name in existing:
+                    print(f"Index {collection_name}.{name} definition changed, rebuilding")
+                    await collection.drop_index(name)
+                await collection.create_indexes([model])
+                created.setdefault(collection_name, []).append(name)
+                print(f"Created index {collection_name}.{name}")
+            except OperationFailure as e:
+                # Typically duplicate keys blocking a unique index; don't take the API down for it
+                print(f"Could not create index {collection_name}.{name}: {e}")
+    return created
+
+
+async def require_indexes(db) -> None:
+    """
+    Raise unless the indexes that correctness depends on exist: guarded day
+    upserts detect lost races only through duplicate keys on user_day_unique,
+    and without it they would insert duplicate days.
+    """
+    missing = await missing_indexes(db)
+    absent = [
+        f"{collection_name}.{name}"
+        for collection_name, names in REQUIRED_INDEXES.items()
+        for name in names
+        if name in missing.get(collection_name, [])
+    ]
+    if absent:
+        raise RuntimeError(
+            f"Required indexes missing: {', '.join(absent)}. "
+            "Remove duplicate day documents, then run python -m Schedule.indexes sync"
+        )
+
+
+async def missing_indexes(db) -> Dict[str, List[str]]:
+    missing: Dict[str, List[str]] = {}
+    for collection_name, models in INDEXES.items():
+        existing = await db[collection_name].index_information()
+        for model in models:
+            declared = model.document
+            if not any(_index_matches(info, declared) for info in existing.values()):
+                missing.setdefault(collection_name, []).append(declared["name"])
+    return missing
+
+
+def _uses_collscan(plan: Dict[str, Any]) -> bool:
+    if plan.get("stage") == "COLLSCAN":
+        return True
+    children = plan.get("inputStages", [])
+    if "inputStage" in plan:
+        children = children + [plan["inputStage"]]
+    return any(_uses_collscan(child) for child in children)
+
+
+async def index_report(db) -> None:
+    for collection_name in INDEXES:
+        print(f"\n== {collection_name} ==")
+        try:
+            stats = await db[collection_name].aggregate([{"$indexStats": {}}]).to_list(length=None)
+        except OperationFailure as e:
+            print(f"  $indexStats unavailable: {e}")
+            stats = []
+        for stat in sorted(stats, key=lambda s: s["name"]):
+            accesses = stat.get("accesses", {})
+            print(f"  {stat['name']:<24} ops={accesses.get('ops', 0):<10} since={accesses.get('since')}")
+
+    missing = await missing_indexes(db)
+    print()
+    if missing:
+        for collection_name, names in missing.items():
+            for name in names:
+                print(f"WARNING: missing index {collection_name}.{name}")
+    else:
+        print("All declared indexes are present")
+
+    for label, collection_name, query in HOT_QUERIES:
+        try:
+            explain = await db[collection_name].find(query).explain()
+        except OperationFailure as e:
+            print(f"WARNING: could not explain {label}: {e}")
+            continue
+        if _uses_collscan(explain.get("queryPlanner", {}).get("winningPlan", {})):
+            print(f"WARNING: {label} on {collection_name} runs as a collection scan")
+
+
+async def main(command: str) -> None:
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URL"))
+    database = client[os.getenv("DATABASE_NAME", "Vibeprep_Users")]
+    try:
+        if command == "sync":
+            created = await ensure_indexes(database)
+            print(f"Created: {created or 'nothing, indexes already up to date'}")
+        else:
+            await index_report(database)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "report"
+    if command not in ("sync", "report"):
+        print("Usage: python -m Schedule.indexes [sync|report]")
+        sys.exit(1)
+    asyncio.run(main(command))
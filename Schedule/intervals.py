@@ -0,0 +1,210 @@
+"""
+Time-slot strings parsed into minute intervals.
+
+Slots are stored as free-form strings ("09:00-10:00", "6:00 AM - 6:30 AM",
+"11:00 PM-6:00 AM"). `parse_time_slot` turns them into a half-open
+[start, end) interval in minutes from midnight, where start is in [0, 1440)
+and an end at or before the start wraps past midnight (end up to 2880).
+The interval is stored next to each slot as {"start": int, "end": int}.
+
+`IntervalIndex` answers overlap and point queries for one day with a static
+interval tree, in O(log n) per match found (O(log n) when nothing matches). A day is treated as circular: "11:00 PM-6:00 AM"
+covers both the end and the start of the day it is stored on, since a daily
+schedule repeats.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+
+_TIME = r"(\d{1,2})(?:[:.](\d{2}))?\s*([AaPp]\.?\s*[Mm]\.?)?"
+_TIME_RE = re.compile(rf"^\s*{_TIME}\s*$")
+_SLOT_RE = re.compile(rf"^\s*{_TIME}\s*(?:-|–|—|to)\s*{_TIME}\s*$")
+
+
+def _to_minutes(hours: str, minutes: Optional[str], meridiem: Optional[str], allow_end_of_day: bool = False) -> int:
+    hour = int(hours)
+    minute = int(minutes) if minutes else 0
+    if minute > 59:
+        raise ValueError(f"Invalid minutes: {minutes}")
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ValueError(f"Invalid 12-hour time: {hour}")
+        hour = hour % 12 + (12 if meridiem[0].lower() == "p" else 0)
+    elif hour == 24 and minute == 0 and allow_end_of_day:
+        return MINUTES_PER_DAY
+    elif hour > 23:
+        raise ValueError(f"Invalid hour: {hour}")
+    return hour * 60 + minute
+
+
+def parse_time(value: str) -> int:
+    """Minutes from midnight for a single time such as "14:30" or "2:30 PM" """
+    match = _TIME_RE.match(value)
+    if not match:
+        raise ValueError(f"Unrecognised time: {value!r}")
+    return _to_minutes(*match.groups())
+
+
+def parse_time_slot(time_slot: str) -> Tuple[int, int]:
+    """
+    (start, end) minutes for a slot string. A missing AM/PM on the start is
+    taken from the end ("9-10 AM"). Raises ValueError for strings that are not
+    a time range or describe an empty one.
+    """
+    match = _SLOT_RE.match(time_slot)
+    if not match:
+        raise ValueError(f"Unrecognised time slot: {time_slot!r}")
+    start_hours, start_minutes, start_meridiem, end_hours, end_minutes, end_meridiem = match.groups()
+    start = _to_minutes(start_hours, start_minutes, start_meridiem or end_meridiem)
+    end = _to_minutes(end_hours, end_minutes, end_meridiem, allow_end_of_day=True)
+    if end == start:
+        raise ValueError(f"Empty time slot: {time_slot!r}")
+    if end < start:
+        end += MINUTES_PER_DAY
+    return start, end
+
+
+def slot_interval(time_slot: str) -> Optional[Dict[str, int]]:
+    """Stored interval for a slot string, or None if it isn't a parseable time range"""
+    try:
+        start, end = parse_time_slot(time_slot)
+    except ValueError:
+        return None
+    return {"start": start, "end": end}
+
+
+class IntervalIndex:
+    """
+    Static interval tree over one day's intervals: entries sorted by start
+    form an implicit balanced binary tree (each range's middle entry is its
+    root), and every node keeps the largest end in its subtree. A query skips
+    subtrees whose largest end is at or before its start and everything right
+    of a node starting at or after its end, so every subtree it enters below
+    a matching path holds a match: O(log n) per match, and O(log n) when
+    nothing matches. Wrapping intervals are matched by also probing the
+    query shifted a day either way.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[int, int, Any]]):
+        self._entries = sorted(entries, key=lambda entry: (entry[0], entry[1]))
+        self._max_ends = [0] * len(self._entries)
+        self._build(0, len(self._entries))
+
+    def _build(self, lo: int, hi: int) -> int:
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        self._max_ends[mid] = max(self._entries[mid][1], self._build(lo, mid), self._build(mid + 1, hi))
+        return self._max_ends[mid]
+
+    @classmethod
+    def from_slots(cls, slots: List[Any]) -> "IntervalIndex":
+        """Index stored or request slots by position; unparseable slots are left out"""
+        entries = []
+        for position, slot in enumerate(slots):
+            time_slot = slot if isinstance(slot, str) else slot.get("time_slot", "")
+            interval = None if isinstance(slot, str) else slot.get("interval")
+            interval = interval or slot_interval(time_slot)
+            if interval:
+                entries.append((interval["start"], interval["end"], position))
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _scan(self, start: int, end: int) -> List[Tuple[int, int, Any]]:
+        found = []
+        ranges = [(0, len(self._entries))]
+        while ranges:
+            lo, hi = ranges.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_ends[mid] <= start:
+                continue
+            ranges.append((lo, mid))
+            entry = self._entries[mid]
+            if entry[0] < end:
+                if entry[1] > start:
+                    found.append(entry)
+                ranges.append((mid + 1, hi))
+        return found
+
+    def overlapping(self, start: int, end: int) -> List[Any]:
+        """Values of every entry overlapping [start, end), in start order"""
+        found = {}
+        for shift in (-MINUTES_PER_DAY, 0, MINUTES_PER_DAY):
+            for entry in self._scan(start + shift, end + shift):
+                found[id(entry)] = entry
+        return [entry[2] for entry in sorted(found.values(), key=lambda entry: (entry[0], entry[1]))]
+
+    def at(self, minute: int) -> List[Any]:
+        """Values of the entries covering a minute of the day"""
+        return self.overlapping(minute, minute + 1)
+
+
+def find_overlaps(time_slots: List[str]) -> List[Tuple[str, str]]:
+    """Pairs of distinct slot strings in one list whose intervals overlap"""
+    index = IntervalIndex.from_slots([{"time_slot": time_slot} for time_slot in time_slots])
+    pairs = []
+    seen = set()
+    for time_slot in time_slots:
+        interval = slot_interval(time_slot)
+        if not interval:
+            continue
+        for other in index.overlapping(interval["start"], interval["end"]):
+            pair = frozenset((time_slot, time_slots[other]))
+            if len(pair) == 2 and pair not in seen:
+                seen.add(pair)
+                pairs.append((time_slot, time_slots[other]))
+    return pairs
+
+
+def format_minutes(minutes: int) -> str:
+    """Minutes from midnight as HH:MM; the end of the day is 24:00"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def day_segments(start: int, end: int) -> List[Tuple[int, int, int]]:
+    """
+    An interval split at midnight into (day offset, start, end) parts: the
+    part of an overnight slot after midnight falls on the next day (offset 1)
+    """
+    if end <= MINUTES_PER_DAY:
+        return [(0, start, end)]
+    return [(0, start, MINUTES_PER_DAY), (1, 0, end - MINUTES_PER_DAY)]
+
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sort-and-sweep union of intervals; touching intervals are merged"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_gaps(
+    busy: List[Tuple[int, int]],
+    window_start: int = 0,
+    window_end: int = MINUTES_PER_DAY,
+    min_minutes: int = 1
+) -> List[Tuple[int, int]]:
+    """Gaps of at least min_minutes inside [window_start, window_end) between merged busy intervals"""
+    gaps = []
+    cursor = window_start
+    for start, end in busy:
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start - cursor >= min_minutes:
+            gaps.append((cursor, start))
+        cursor = max(cursor, end)
+    if window_end - cursor >= min_minutes:
+        gaps.append((cursor, window_end))
+    return gaps
@@ -0,0 +1,250 @@
+"""
+Online data migrations for calendar_data.
+
+Each migration walks the documents that still need it in _id order, in small
+batches, and records a checkpoint after every batch so it can be stopped and
+resumed against a live cluster. A migration is only marked completed once a
+run leaves no document behind; otherwise the next run starts from the
+beginning again. Throughput is printed as it goes and
+--pause throttles it.
+
+    python -m Schedule.migrations day_key --batch-size 500 --pause 0.2
+    python -m Schedule.migrations canonical_slots --max-rate 200
+    python -m Schedule.migrations month_stats
+    python -m Schedule.migrations tasks
+    python -m Schedule.migrations updated_at
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from .slots import SCHEMA_VERSION, convert_legacy_slots, slots_to_dicts
+from .stats import day_stats_update, record_days_stats
+from .tasks import sync_days_tasks
+
+load_dotenv()
+
+CALENDAR_COLLECTION = "calendar_data"
+MIGRATIONS_COLLECTION = "schema_migrations"
+
+# Server-side equivalent of slots.day_key
+DAY_KEY_EXPRESSION = {
+    "$add": [
+        {"$multiply": ["$year", 10000]},
+        {"$multiply": ["$month", 100]},
+        "$date"
+    ]
+}
+
+
+async def backfill_day_key(collection, docs: List[Dict[str, Any]]) -> None:
+    await collection.update_many(
+        {"_id": {"$in": [doc["_id"] for doc in docs]}},
+        [{"$set": {"day_key": DAY_KEY_EXPRESSION}}]
+    )
+
+
+async def canonicalize_slots(collection, docs: List[Dict[str, Any]]) -> int:
+    """
+    Rewrite legacy slots (bare strings, dicts without time_slot) into the
+    canonical {time_slot, task, interval} shape and stamp schema_version. Each update is
+    conditional on the version read, so a concurrent API write wins. Returns
+    the number of documents left as they were: those lost to a concurrent
+    write and those whose slots could not be converted.
+    """
+    skipped = 0
+    operations = []
+    for doc in docs:
+        try:
+            slots = slots_to_dicts(convert_legacy_slots(doc.get("slots", [])))
+        except ValueError as e:
+            print(f"[canonical_slots] skipping {doc['_id']}: {e}")
+            skipped += 1
+            continue
+        version = doc.get("version")
+        operations.append(UpdateOne(
+            {"_id": doc["_id"], "version": version if version is not None else {"$exists": False}},
+            {"$set": {"slots": slots, "schema_version": SCHEMA_VERSION}}
+        ))
+    if not operations:
+        return skipped
+    try:
+        result = await collection.bulk_write(operations, ordered=False)
+        matched = result.matched_count
+    except BulkWriteError as bwe:
+        print(f"[canonical_slots] {len(bwe.details.get('writeErrors', []))} writes failed in batch")
+        matched = bwe.details.get("nMatched", 0)
+    return skipped + len(operations) - matched
+
+
+async def backfill_month_stats(collection, docs: List[Dict[str, Any]]) -> None:
+    """
+    Record every day in calendar_month_stats. Safe to rerun and to run while
+    the API is writing: each day is recorded with its own updated_at, so a
+    newer entry from a live write is never overwritten.
+    """
+    await record_days_stats(collection.database, [
+        day_stats_update(doc["user_id"], doc["year"], doc["month"], doc["date"], doc)
+        for doc in docs
+    ])
+
+
+async def backfill_tasks(collection, docs: List[Dict[str, Any]]) -> None:
+    """
+    Build the tasks collection from calendar_data. Days written by the API in
+    the meantime are left alone, since their task documents are newer. Search
+    switches over to the tasks collection once this has completed.
+    """
+    await sync_days_tasks(collection.database, docs)
+
+
+async def backfill_updated_at(collection, docs: List[Dict[str, Any]]) -> None:
+    """Stamp days written outside the API so the changes feed can see them"""
+    await collection.update_many(
+        {"_id": {"$in": [doc["_id"] for doc in docs]}, "updated_at": {"$exists": False}},
+        [{"$set": {"updated_at": {"$ifNull": ["$created_at", "$$NOW"]}}}]
+    )
+
+
+MIGRATIONS: Dict[str, Dict[str, Any]] = {
+    "day_key": {
+        "query": {"day_key": {"$exists": False}},
+        "projection": {"_id": 1},
+        "handler": backfill_day_key,
+    },
+    "canonical_slots": {
+        "query": {"schema_version": {"$ne": SCHEMA_VERSION}},
+        "projection": {"slots": 1, "version": 1},
+        "handler": canonicalize_slots,
+    },
+    "month_stats": {
+        "query": {},
+        "projection": {"user_id": 1, "year": 1, "month": 1, "date": 1, "slots": 1, "updated_at": 1},
+        "handler": backfill_month_stats,
+    },
+    "updated_at": {
+        "query": {"updated_at": {"$exists": False}},
+        "projection": {"_id": 1},
+        "handler": backfill_updated_at,
+    },
+    "tasks": {
+        "query": {},
+        "projection": {"user_id": 1, "year": 1, "month": 1, "date": 1, "slots": 1, "updated_at": 1},
+        "handler": backfill_tasks,
+    },
+}
+
+
+async def run_migration(
+    db,
+    name: str,
+    batch_size: int = 500,
+    pause: float = 0.0,
+    restart: bool = False,
+    max_docs: Optional[int] = None,
+    max_rate: Optional[float] = None
+) -> int:
+    """
+    Run a registered migration from its last checkpoint. `pause` sleeps a fixed
+    time between batches; `max_rate` caps throughput in documents per second.
+    Returns the number of documents processed.
+    """
+    migration = MIGRATIONS[name]
+    collection = db[CALENDAR_COLLECTION]
+    checkpoints = db[MIGRATIONS_COLLECTION]
+
+    checkpoint = None if restart else await checkpoints.find_one({"_id": name})
+    last_id = checkpoint.get("last_id") if checkpoint else None
+    remaining = await collection.count_documents(migration["query"])
+    print(f"[{name}] {remaining} documents to migrate" + (f", resuming after {last_id}" if last_id else ""))
+
+    processed = 0
+    skipped = 0
+    started = time.perf_counter()
+    while max_docs is None or processed < max_docs:
+        query = dict(migration["query"])
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        limit = batch_size if max_docs is None else min(batch_size, max_docs - processed)
+        docs = await (
+            collection.find(query, migration.get("projection"))
+            .sort("_id", 1)
+            .limit(limit)
+            .to_list(length=None)
+        )
+        if not docs:
+            break
+
+        skipped += await migration["handler"](collection, docs) or 0
+        processed += len(docs)
+        last_id = docs[-1]["_id"]
+        await checkpoints.update_one(
+            {"_id": name},
+            {
+                "$set": {"last_id": last_id, "updated_at": datetime.utcnow(), "completed": False},
+                "$inc": {"processed": len(docs)}
+            },
+            upsert=True
+        )
+
+        elapsed = time.perf_counter() - started
+        if max_rate and processed / max_rate > elapsed:
+            await asyncio.sleep(processed / max_rate - elapsed)
+            elapsed = time.perf_counter() - started
+        rate = processed / elapsed if elapsed else 0.0
+        print(f"[{name}] {processed}/{remaining} documents ({rate:.0f} docs/s)")
+        if pause:
+            await asyncio.sleep(pause)
+
+    if skipped:
+        # The checkpoint has moved past them; start over so the next run retries them
+        await checkpoints.update_one(
+            {"_id": name},
+            {"$set": {"last_id": None, "completed": False, "skipped": skipped, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        print(f"[{name}] {skipped} documents were left unmigrated, run again to retry them")
+    elif max_docs is None or processed < max_docs:
+        await checkpoints.update_one(
+            {"_id": name},
+            {"$set": {"completed": True, "skipped": 0, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        print(f"[{name}] done, {processed} documents in {time.perf_counter() - started:.1f}s")
+    return processed
+
+
+async def main(args) -> None:
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URL"))
+    database = client[os.getenv("DATABASE_NAME", "Vibeprep_Users")]
+    try:
+        await run_migration(
+            database,
+            args.name,
+            batch_size=args.batch_size,
+            pause=args.pause,
+            restart=args.restart,
+            max_docs=args.max_docs,
+            max_rate=args.max_rate
+        )
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a calendar_data migration")
+    parser.add_argument("name", choices=sorted(MIGRATIONS))
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    parser.add_argument("--max-rate", type=float, help="Maximum documents per second")
+    parser.add_argument("--max-docs", type=int, help="Stop after this many documents")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,28 @@
+"""
+orjson-backed response class for the calendar read endpoints.
+
+Handlers that return FastJSONResponse skip FastAPI's response_model validation
+and jsonable_encoder pass; they must only hand it data that is already in the
+response shape (see slots.stored_slots).
+"""
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize response content the way FastJSONResponse does, e.g. for NDJSON lines"""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
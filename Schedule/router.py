@@ -1,22 +1,60 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import Dict, Any, List, Optional
-from datetime import datetime
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, OperationFailure
+from fastapi import APIRouter, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, List, Literal, Optional, Tuple
+from datetime import MAXYEAR, MINYEAR, datetime, date as Date, timedelta
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure, DuplicateKeyError, OperationFailure
 import os
+import re
+import asyncio
+import calendar
 import json
+import time
+import base64
+import hashlib
 from dotenv import load_dotenv
 from urllib.parse import quote_plus
 from pydantic import BaseModel, Field
+from bson import ObjectId
 
 from .schema import (
     SlotUpdate, SlotResponse, SlotCreateResponse, SlotUpdateResponse, 
     SlotDeleteResponse, UserCalendarResponse, MonthCalendarResponse,
     ErrorResponse, TaskUpdate, TaskAssignResponse, SimpleSlotUpdate,
-    Task, SlotWithTask, TaskSearchResponse, CalendarDocument
+    Task, TaskSearchResponse, CalendarDocument,
+    TaskStatusUpdate, TaskStatusResponse, TaskClearResponse, RangeCalendarResponse,
+    BulkSlotUpdate, BulkSlotResponse, BulkSlotDayResult, SlotLookupResponse,
+    FreeBusyResponse, VersionConflictResponse, MonthStatsResponse, TaskLookupResponse,
+    TaskTextSearchResponse, ChangesResponse, TemplateListResponse, TemplateBindingCreate,
+    TemplateBindingResponse, TemplateBindingsResponse, SlotBatchRequest, SlotBatchResponse
 )
 
 from .agent import optimize_with_prompt, OptimizedSchedule
+from .indexes import ensure_indexes, require_indexes, TOMBSTONES_COLLECTION, TOMBSTONE_RETENTION_SECONDS
+from .cache import TTLCache, MISSING
+from .intervals import (
+    IntervalIndex, parse_time, parse_time_slot, slot_interval,
+    day_segments, merge_intervals, free_gaps, format_minutes, MINUTES_PER_DAY
+)
+from .responses import FastJSONResponse, dumps
+from .stats import STATS_COLLECTION, day_stats_update, record_day_stats, record_days_stats, empty_totals
+from .tasks import (
+    TASKS_COLLECTION, mark_tasks_dirty, repair_dirty_tasks, sync_day_tasks, sync_days_tasks,
+    task_response, task_rows
+)
+from .search import InvertedIndex
+from .events import ChangeHub, RESYNC_EVENT, follow_change_stream
+from .templates import (
+    TEMPLATES_COLLECTION, BINDINGS_COLLECTION, template_weekdays, template_slots,
+    template_revision, template_day, template_days, binding_for_day, project_slots,
+    bindings_overlap
+)
+from .migrations import MIGRATIONS_COLLECTION
+from .slots import (
+    SCHEMA_VERSION, slots_to_dicts, normalize_slot_dicts, stored_slots,
+    TASK_FIELDS, COMPACT_TASK_FIELDS, day_projection, day_key
+)
 
 load_dotenv()
 
@@ -29,15 +67,68 @@ def get_mongodb_url():
 MONGODB_URL = get_mongodb_url()
 DATABASE_NAME = os.getenv("DATABASE_NAME", "Vibeprep_Users")
 COLLECTION_NAME = "calendar_data"
+MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+STREAM_BATCH_SIZE = int(os.getenv("CALENDAR_STREAM_BATCH_SIZE", "200"))
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_RANGE_DAYS = 366
+MAX_BULK_DAYS = 400
+MAX_BATCH_KEYS = 400
+CACHE_TTL_SECONDS = float(os.getenv("CALENDAR_CACHE_TTL", "30"))
+# How often to re-check whether the tasks backfill has finished before trusting the tasks collection
+TASKS_READY_RECHECK_SECONDS = 60
+# "auto" uses the MongoDB text index when the server supports it, "local" always uses the in-process index
+TEXT_SEARCH_BACKEND = os.getenv("CALENDAR_TEXT_SEARCH", "auto")
+# After a failed $text query, how long to stay on the in-process index before trying again
+TEXT_SEARCH_RECHECK_SECONDS = 300
+MAX_SEARCH_RESULTS = 100
+# Change tokens stay this far behind the clock, so writes stamped just before a
+# sync but committed just after it are still picked up by the next one
+SYNC_LAG_SECONDS = 5
+# "local" publishes change events from this worker's own writes; "change_stream"
+# follows MongoDB so events from every worker reach every subscriber
+PUSH_SOURCE = os.getenv("CALENDAR_PUSH_SOURCE", "local")
+PUSH_HEARTBEAT_SECONDS = float(os.getenv("CALENDAR_PUSH_HEARTBEAT", "25"))
+SSE_MEDIA_TYPE = "text/event-stream"
+# Attempts at a version-guarded merge before giving up on a day under heavy concurrent writes
+MERGE_ATTEMPTS = 3
+# If-Match values accepted by writes: a day ETag as served by the GET endpoints
+DAY_ETAG_RE = re.compile(r'"([0-9a-f]{24})-(\d+)"')
+# ETag of a day served from a template binding: binding id and template revision
+TEMPLATE_ETAG_RE = re.compile(r'"t-([0-9a-f]{24})-([0-9a-f]+)"')
+# If-Match: "none" (the ETag of a missing day) only lets the write create the day
+MUST_NOT_EXIST = {"_id": {"$exists": False}}
 
 print(f"MongoDB URL: {MONGODB_URL}")
 print(f"Database Name: {DATABASE_NAME}")
 
 class MongoDB:
-    client: MongoClient = None
+    client: AsyncIOMotorClient = None
     database = None
+    # Replica sets and sharded clusters only; standalone servers have no transactions
+    supports_transactions: bool = False
+    tasks_ready: bool = False
+    tasks_checked_at: float = 0.0
+    slots_canonical: bool = False
+    slots_checked_at: float = 0.0
+    text_search_failed_at: float = 0.0
+    change_stream_task: Optional[asyncio.Task] = None
 
 mongodb = MongoDB()
+# Subscribers of the push endpoints, per user
+change_hub = ChangeHub()
+
+# Read-through caches for single days and whole months; entries expire after
+# CACHE_TTL_SECONDS so other workers' writes become visible within that window
+day_cache = TTLCache(int(os.getenv("CALENDAR_DAY_CACHE_SIZE", "10000")), CACHE_TTL_SECONDS)
+month_cache = TTLCache(int(os.getenv("CALENDAR_MONTH_CACHE_SIZE", "2000")), CACHE_TTL_SECONDS)
+# Per-user inverted indexes for task text search without a MongoDB text index
+search_indexes = TTLCache(int(os.getenv("CALENDAR_SEARCH_CACHE_SIZE", "1000")), CACHE_TTL_SECONDS)
+# Template bindings of a user with their templates' slots, dropped when the bindings change
+template_bindings = TTLCache(int(os.getenv("CALENDAR_TEMPLATE_CACHE_SIZE", "1000")), CACHE_TTL_SECONDS)
+# Interval indexes built from cached day documents, reused while the day's version is unchanged
+interval_indexes = TTLCache(int(os.getenv("CALENDAR_DAY_CACHE_SIZE", "10000")), CACHE_TTL_SECONDS)
 
 class ScheduleOptimizationRequest(BaseModel):
     user_prompt: str = Field(..., description="User's optimization request", example="Help me balance my study schedule better")
@@ -48,18 +139,30 @@ class ScheduleOptimizationResponse(BaseModel):
     optimized_schedule: OptimizedSchedule = Field(..., description="The optimized schedule")
     message: str = Field(..., description="Response message")
 
-def connect_to_mongo():
+async def connect_to_mongo():
     try:
         print(f"Connecting to MongoDB...")
-        mongodb.client = MongoClient(
+        mongodb.client = AsyncIOMotorClient(
             MONGODB_URL,
             serverSelectionTimeoutMS=5000,
             connectTimeoutMS=5000,
-            socketTimeoutMS=5000
+            socketTimeoutMS=5000,
+            maxPoolSize=MAX_POOL_SIZE
         )
         mongodb.database = mongodb.client[DATABASE_NAME]
-        mongodb.client.admin.command('ping')
+        await mongodb.client.admin.command('ping')
         print(f"Successfully connected to MongoDB database: {DATABASE_NAME}")
+        hello = await mongodb.client.admin.command('hello')
+        mongodb.supports_transactions = bool(hello.get("setName") or hello.get("msg") == "isdbgrid")
+        await ensure_indexes(mongodb.database)
+        await require_indexes(mongodb.database)
+        if PUSH_SOURCE == "change_stream":
+            if mongodb.supports_transactions:
+                mongodb.change_stream_task = asyncio.create_task(
+                    follow_change_stream(mongodb.database, remote_day_written)
+                )
+            else:
+                print("Change streams need a replica set; pushing this worker's writes only")
     except OperationFailure as e:
         print(f"Authentication/Operation failed: {e}")
         if "authentication failed" in str(e).lower():
@@ -75,6 +178,9 @@ def connect_to_mongo():
         raise e
 
 def close_mongo_connection():
+    if mongodb.change_stream_task:
+        mongodb.change_stream_task.cancel()
+        mongodb.change_stream_task = None
     if mongodb.client:
         mongodb.client.close()
         print("Disconnected from MongoDB")
@@ -87,60 +193,692 @@ def get_database():
         )
     return mongodb.database
 
-def convert_legacy_slots(slots: List[Any]) -> List[SlotWithTask]:
-    converted_slots = []
+def first_per_time_slot(slots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Slots to merge into a day, keeping the first of any repeated time slot"""
+    unique = []
+    seen_time_slots = set()
     for slot in slots:
-        if isinstance(slot, str):
-            converted_slots.append(SlotWithTask(time_slot=slot, task=None))
-        elif isinstance(slot, dict):
-            if "time_slot" in slot:
-                task_data = slot.get("task")
-                task = Task(**task_data) if task_data else None
-                converted_slots.append(SlotWithTask(time_slot=slot["time_slot"], task=task))
-            else:
-                converted_slots.append(SlotWithTask(time_slot=slot.get("time_slot", ""), task=None))
-    return converted_slots
+        if slot["time_slot"] in seen_time_slots:
+            continue
+        seen_time_slots.add(slot["time_slot"])
+        unique.append(slot)
+    return unique
 
-def get_calendar_document(
-    user_id: str, 
-    year: int, 
-    month: int, 
+def merge_slots_pipeline(new_slots: List[Dict[str, Any]], key: int, now: datetime) -> List[Dict[str, Any]]:
+    """
+    Update pipeline that appends new_slots to the stored slots, skipping any
+    whose time_slot is already present. Legacy string slots count by value.
+    """
+    existing_slots = {"$ifNull": ["$slots", []]}
+    existing_time_slots = {
+        "$map": {
+            "input": existing_slots,
+            "as": "slot",
+            "in": {
+                "$cond": [
+                    {"$eq": [{"$type": "$$slot"}, "string"]},
+                    "$$slot",
+                    "$$slot.time_slot"
+                ]
+            }
+        }
+    }
+    return [
+        {
+            "$set": {
+                "slots": {
+                    "$concatArrays": [
+                        existing_slots,
+                        {
+                            "$filter": {
+                                "input": {"$literal": new_slots},
+                                "as": "new_slot",
+                                "cond": {"$not": [{"$in": ["$$new_slot.time_slot", existing_time_slots]}]}
+                            }
+                        }
+                    ]
+                },
+                "day_key": key,
+                "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]},
+                # Appending canonical slots keeps a canonical day canonical; legacy days stay unstamped
+                "schema_version": {
+                    "$cond": [
+                        {"$or": [
+                            {"$eq": ["$schema_version", SCHEMA_VERSION]},
+                            {"$eq": [{"$size": existing_slots}, 0]}
+                        ]},
+                        SCHEMA_VERSION,
+                        "$$REMOVE"
+                    ]
+                },
+                "updated_at": now,
+                "created_at": {"$ifNull": ["$created_at", now]}
+            }
+        }
+    ]
+
+def version_guard(doc: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Filter clause matching a day only while it still has the version `doc` was
+    read at. Combined with upsert, a write that lost a race fails on the unique
+    day index instead of applying to a day the caller has not seen.
+    """
+    if doc and doc.get("version") is not None:
+        return {"version": doc["version"]}
+    return {"version": {"$exists": False}}
+
+def if_match_filter(request: Request) -> Optional[Dict[str, Any]]:
+    """
+    Filter clause for a write's If-Match header: None without one, otherwise a
+    clause matching the day only at the tagged version. "*" matches any
+    existing day and "none" only lets the write create a missing day.
+    """
+    header = request.headers.get("if-match")
+    if not header:
+        return None
+    tag = header.strip()
+    if tag == "*":
+        return {"_id": {"$exists": True}}
+    if tag == '"none"':
+        return MUST_NOT_EXIST
+    template = TEMPLATE_ETAG_RE.fullmatch(tag)
+    if template:
+        # Still the template day: not stored yet, or stored from it and unchanged since
+        return {"$or": [MUST_NOT_EXIST, {
+            "template.binding_id": ObjectId(template.group(1)),
+            "template.revision": template.group(2),
+            "version": {"$exists": False}
+        }]}
+    match = DAY_ETAG_RE.fullmatch(tag)
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must be a single ETag of this day as returned by the API"
+        )
+    version = int(match.group(2))
+    return {"_id": ObjectId(match.group(1)), "version": version if version else {"$exists": False}}
+
+def if_match_holds(request: Request, doc: Optional[Dict[str, Any]]) -> bool:
+    tag = request.headers.get("if-match", "").strip()
+    if tag == "*":
+        return doc is not None
+    if doc is None and TEMPLATE_ETAG_RE.fullmatch(tag):
+        return True
+    return tag == day_etag(doc)
+
+def allows_insert(precondition: Optional[Dict[str, Any]]) -> bool:
+    """Whether a write under this if_match_filter clause may create the day"""
+    return precondition is None or precondition == MUST_NOT_EXIST or MUST_NOT_EXIST in precondition.get("$or", [])
+
+async def version_conflict(user_id: str, year: int, month: int, date: int) -> Response:
+    """409 carrying the day as it is now, so the client can rebase its change and retry once"""
+    db = get_database()
+    doc = await db[COLLECTION_NAME].find_one(day_filter(user_id, year, month, date))
+    etag = day_etag(doc)
+    return FastJSONResponse(
+        {
+            "detail": "The day was modified since it was read",
+            "etag": etag,
+            "current": day_response_dict(doc) if doc else None
+        },
+        status_code=status.HTTP_409_CONFLICT,
+        headers=etag_headers(etag)
+    )
+
+async def missing_or_conflict(
+    request: Request,
+    user_id: str,
+    year: int,
+    month: int,
     date: int
-) -> Optional[Dict[str, Any]]:
+) -> Optional[Response]:
+    """After a conditional write matched nothing: the 409 if If-Match no longer holds, else None"""
+    if not request.headers.get("if-match"):
+        return None
     db = get_database()
-    return db[COLLECTION_NAME].find_one({
+    doc = await db[COLLECTION_NAME].find_one(day_filter(user_id, year, month, date))
+    if if_match_holds(request, doc):
+        return None
+    return await version_conflict(user_id, year, month, date)
+
+def slot_conflicts(stored: List[Any], new_slots: List[Dict[str, Any]]) -> List[str]:
+    """Descriptions of new slots that overlap a stored slot with a different time_slot"""
+    existing = normalize_slot_dicts(stored)
+    index = IntervalIndex.from_slots(existing)
+    conflicts = []
+    for slot in new_slots:
+        interval = slot.get("interval")
+        if not interval or not len(index):
+            continue
+        for position in index.overlapping(interval["start"], interval["end"]):
+            if existing[position]["time_slot"] != slot["time_slot"]:
+                conflicts.append(f"{slot['time_slot']} / {existing[position]['time_slot']}")
+    return conflicts
+
+def day_filter(user_id: str, year: int, month: int, date: int) -> Dict[str, Any]:
+    return {
         "user_id": user_id,
         "year": year,
         "month": month,
         "date": date
-    })
+    }
+
+def days_on_or_after(year: int, month: int, date: int) -> Dict[str, Any]:
+    """Query clause matching day documents on or after the given day, usable with the (user_id, year, month, date) index"""
+    return {"$or": [
+        {"year": {"$gt": year}},
+        {"year": year, "month": {"$gt": month}},
+        {"year": year, "month": month, "date": {"$gte": date}}
+    ]}
+
+def days_after(year: int, month: int, date: int) -> Dict[str, Any]:
+    return {"$or": [
+        {"year": {"$gt": year}},
+        {"year": year, "month": {"$gt": month}},
+        {"year": year, "month": month, "date": {"$gt": date}}
+    ]}
+
+def days_on_or_before(year: int, month: int, date: int) -> Dict[str, Any]:
+    return {"$or": [
+        {"year": {"$lt": year}},
+        {"year": year, "month": {"$lt": month}},
+        {"year": year, "month": month, "date": {"$lte": date}}
+    ]}
+
+def encode_cursor(values: List[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decode an opaque keyset cursor holding `size` values"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return values
+
+def day_etag(doc: Optional[Dict[str, Any]]) -> str:
+    """
+    Strong ETag for a day: document id plus its write counter. The id changes
+    if the day is deleted and recreated, so versions never collide.
+    """
+    if not doc:
+        return '"none"'
+    if doc.get("template") and doc.get("version") is None:
+        # A template day, or one stored from the template and not written since
+        return f'"t-{doc["template"]["binding_id"]}-{doc["template"]["revision"]}"'
+    return f'"{doc["_id"]}-{doc.get("version", 0)}"'
+
+def month_etag(documents: List[Dict[str, Any]], variant: str = "") -> str:
+    """Hash of the month's day tags; `variant` keeps compact and full representations apart"""
+    day_tags = sorted(f"{doc['date']}:{day_etag(doc)}" for doc in documents)
+    return '"m-' + hashlib.sha1((variant + "|" + "|".join(day_tags)).encode()).hexdigest()[:20] + '"'
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison: any listed tag, weak or strong, or *"""
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(
+        (tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates
+    )
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+def not_modified_response(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 if the client already has this version"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    return None
+
+def day_response_dict(doc: Dict[str, Any], projected: bool = False) -> Dict[str, Any]:
+    """
+    A stored day as it appears in month, range and user calendar responses.
+    Copies, never mutates. Projected documents only need their shape filled in
+    (empty tasks come back without a task key), not validation.
+    """
+    slots = normalize_slot_dicts(doc.get("slots", [])) if projected else stored_slots(doc)
+    return {**doc, "_id": str(doc["_id"]) if doc["_id"] else None, "slots": slots}
+
+def resolve_task_fields(view: str, fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Task fields to fetch for a view: None for full documents, otherwise the
+    listed fields (task_id is always kept). `fields` overrides `view`.
+    """
+    if fields:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in TASK_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown task fields {unknown}, allowed: {TASK_FIELDS}"
+            )
+        return ["task_id"] + [field for field in requested if field != "task_id"]
+    if view == "compact":
+        return COMPACT_TASK_FIELDS
+    return None
+
+def invalidate_day(user_id: str, year: int, month: int, date: int) -> None:
+    """Drop cached reads covering this day; call after every write to it"""
+    day_cache.invalidate((user_id, year, month, date))
+    month_cache.invalidate((user_id, year, month))
+    search_indexes.invalidate(user_id)
+
+async def logged(description: str, awaitable) -> bool:
+    """Await a derived-data write, logging instead of raising; True if it succeeded"""
+    try:
+        await awaitable
+        return True
+    except Exception as e:
+        print(f"Could not {description}: {e}")
+        return False
 
-def upsert_calendar_document(
+async def day_written(
     user_id: str,
     year: int,
     month: int,
     date: int,
-    slots: List[Dict[str, Any]]
+    doc: Optional[Dict[str, Any]],
+    deleted_id: Optional[ObjectId] = None
 ) -> None:
+    """
+    Derived data to refresh after a successful write to a day, given the day
+    as stored (None once deleted, with the removed document's id). The
+    updates are independent and run concurrently. Failures are logged, never
+    raised: the write itself has already happened.
+    """
     db = get_database()
-    db[COLLECTION_NAME].update_one(
-        {
+    day = f"{user_id} {year}-{month}-{date}"
+    updates = [
+        logged(f"sync tasks for {day}", run_in_transaction(
+            lambda session: sync_day_tasks(db, user_id, year, month, date, doc, session=session)
+        )),
+        logged(f"update month stats for {day}", record_day_stats(db, user_id, year, month, date, doc)),
+    ]
+    if deleted_id is not None:
+        updates.append(logged(f"record deletion of {day}", db[TOMBSTONES_COLLECTION].insert_one({
             "user_id": user_id,
             "year": year,
             "month": month,
-            "date": date
+            "date": date,
+            "day_id": deleted_id,
+            "deleted_at": datetime.utcnow()
+        })))
+    tasks_synced, *_ = await asyncio.gather(*updates)
+    if not tasks_synced:
+        await tasks_sync_failed(user_id, [(year, month, date)])
+    if mongodb.change_stream_task is None:
+        change_hub.publish(user_id, day_event(year, month, date, doc))
+
+async def days_written(user_id: str, docs: List[Dict[str, Any]]) -> None:
+    """
+    day_written for many stored days of one user, with the month stats and
+    the task documents of all of them written in one bulk write each
+    """
+    db = get_database()
+    tasks_synced, _ = await asyncio.gather(
+        logged(
+            f"sync tasks for {user_id} ({len(docs)} days)",
+            run_in_transaction(lambda session: sync_days_tasks(db, docs, session=session))
+        ),
+        logged(f"update month stats for {user_id} ({len(docs)} days)", record_days_stats(db, [
+            day_stats_update(user_id, doc["year"], doc["month"], doc["date"], doc) for doc in docs
+        ]))
+    )
+    if not tasks_synced:
+        await tasks_sync_failed(user_id, [(doc["year"], doc["month"], doc["date"]) for doc in docs])
+    if mongodb.change_stream_task is None:
+        for doc in docs:
+            change_hub.publish(user_id, day_event(doc["year"], doc["month"], doc["date"], doc))
+
+async def tasks_sync_failed(user_id: str, days: List[Tuple[int, int, int]]) -> None:
+    """Mark days for repair_dirty_tasks, which re-syncs them before the next task read"""
+    try:
+        await mark_tasks_dirty(get_database(), user_id, days)
+    except Exception as e:
+        print(f"Could not mark tasks of {user_id} for repair ({len(days)} days): {e}")
+
+def day_event(year: int, month: int, date: int, doc: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Push notification naming a changed day; doc is None once it is deleted"""
+    return {
+        "type": "day_changed" if doc else "day_deleted",
+        "date": f"{year}-{str(month).zfill(2)}-{str(date).zfill(2)}",
+        "year": year,
+        "month": month,
+        "day": date,
+        "etag": day_etag(doc)
+    }
+
+async def remote_day_written(user_id: str, year: int, month: int, date: int, doc: Optional[Dict[str, Any]]) -> None:
+    """Change stream callback: a day was written, possibly by another worker"""
+    invalidate_day(user_id, year, month, date)
+    change_hub.publish(user_id, day_event(year, month, date, doc))
+
+async def run_in_transaction(callback):
+    """Await callback(session) in a transaction where the deployment supports one, else callback(None)"""
+    if not mongodb.supports_transactions:
+        return await callback(None)
+    async with await mongodb.client.start_session() as session:
+        return await session.with_transaction(callback)
+
+async def slots_canonical() -> bool:
+    """
+    Whether every stored day has canonical slots: true once the canonical_slots
+    migration has completed. Until then sub-field projections of slots would
+    drop legacy bare-string slots, so projected reads fetch whole documents.
+    """
+    if mongodb.slots_canonical:
+        return True
+    if time.monotonic() - mongodb.slots_checked_at < TASKS_READY_RECHECK_SECONDS:
+        return False
+    mongodb.slots_checked_at = time.monotonic()
+    checkpoint = await get_database()[MIGRATIONS_COLLECTION].find_one({"_id": "canonical_slots", "completed": True})
+    mongodb.slots_canonical = checkpoint is not None
+    return mongodb.slots_canonical
+
+async def find_days(query: Dict[str, Any], task_fields: Optional[List[str]], sort=None, limit: int = 0) -> List[Dict[str, Any]]:
+    """
+    Day documents matching a query with only the given task fields on each
+    slot (all of them for None). Projected server-side once slots are
+    canonical, otherwise cut down here from the whole documents.
+    """
+    projected = task_fields is not None and await slots_canonical()
+    cursor = get_database()[COLLECTION_NAME].find(query, day_projection(task_fields) if projected else None)
+    if sort:
+        cursor = cursor.sort(sort)
+    if limit:
+        cursor = cursor.limit(limit)
+    documents = await cursor.to_list(length=None)
+    if task_fields is not None and not projected:
+        documents = [trim_day(doc, task_fields) for doc in documents]
+    return documents
+
+def trim_day(doc: Dict[str, Any], task_fields: List[str]) -> Dict[str, Any]:
+    """A whole day document cut down to the given task fields, as a projection would return it"""
+    return {**doc, "slots": project_slots(normalize_slot_dicts(doc.get("slots", [])), task_fields)}
+
+async def tasks_collection_ready(user_id: str) -> bool:
+    """
+    Whether the tasks collection can answer the user's queries: true once the
+    tasks backfill migration has completed, after re-syncing any of the user's
+    days whose sync failed. Until then task queries keep unwinding
+    calendar_data.
+    """
+    if not mongodb.tasks_ready:
+        if time.monotonic() - mongodb.tasks_checked_at < TASKS_READY_RECHECK_SECONDS:
+            return False
+        mongodb.tasks_checked_at = time.monotonic()
+        checkpoint = await get_database()[MIGRATIONS_COLLECTION].find_one({"_id": "tasks", "completed": True})
+        mongodb.tasks_ready = checkpoint is not None
+        if not mongodb.tasks_ready:
+            return False
+    try:
+        await repair_dirty_tasks(get_database(), user_id)
+    except Exception as e:
+        print(f"Could not repair tasks for {user_id}: {e}")
+    return True
+
+async def get_calendar_document(
+    user_id: str, 
+    year: int, 
+    month: int, 
+    date: int
+) -> Optional[Dict[str, Any]]:
+    """Cached read of one day document. Callers must not mutate the result."""
+    key = (user_id, year, month, date)
+    doc = day_cache.get(key)
+    if doc is not MISSING:
+        return doc
+    
+    generation = day_cache.generation
+    db = get_database()
+    doc = await db[COLLECTION_NAME].find_one(day_filter(user_id, year, month, date))
+    day_cache.set(key, doc, generation)
+    return doc
+
+async def get_month_documents(
+    user_id: str,
+    year: int,
+    month: int,
+    task_fields: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Cached read of every day document in a month, optionally projected down to
+    some task fields. Each projection is cached separately under the month's
+    entry so one invalidation drops them all. Callers must not mutate the result.
+    """
+    key = (user_id, year, month)
+    variant = ",".join(task_fields) if task_fields is not None else "full"
+    variants = month_cache.get(key)
+    if variants is not MISSING and variant in variants:
+        return variants[variant]
+    
+    generation = month_cache.generation
+    documents = await find_days({"user_id": user_id, "year": year, "month": month}, task_fields)
+    month_cache.set(key, {**(variants if variants is not MISSING else {}), variant: documents}, generation)
+    return documents
+
+async def get_calendar_documents(keys: List[Tuple[str, int, int, int]]) -> Dict[Tuple[str, int, int, int], Optional[Dict[str, Any]]]:
+    """
+    Cached read of many day documents: cache hits are served as they are and
+    the misses, across any number of users, are fetched with one $or of day
+    filters on the unique (user_id, year, month, date) index, so days that
+    predate day_key are found too. Missing days map to None. Callers must not
+    mutate the results.
+    """
+    found: Dict[Tuple[str, int, int, int], Optional[Dict[str, Any]]] = {}
+    missing = []
+    for key in dict.fromkeys(keys):
+        doc = day_cache.get(key)
+        if doc is MISSING:
+            missing.append(key)
+        else:
+            found[key] = doc
+    if not missing:
+        return found
+    
+    generation = day_cache.generation
+    db = get_database()
+    fetched = {
+        (doc["user_id"], doc["year"], doc["month"], doc["date"]): doc
+        async for doc in db[COLLECTION_NAME].find({"$or": [day_filter(*key) for key in missing]})
+    }
+    for key in missing:
+        found[key] = fetched.get(key)
+        day_cache.set(key, found[key], generation)
+    return found
+
+async def get_template_bindings(user_id: str) -> List[Dict[str, Any]]:
+    """Cached bindings of a user, each with its template's slots and revision"""
+    bindings = template_bindings.get(user_id)
+    if bindings is not MISSING:
+        return bindings
+    
+    generation = template_bindings.generation
+    db = get_database()
+    bindings = await db[BINDINGS_COLLECTION].find({"user_id": user_id}).sort("start_key", 1).to_list(length=None)
+    if bindings:
+        templates = {
+            template["_id"]: template
+            for template in await db[TEMPLATES_COLLECTION].find(
+                {"_id": {"$in": list({binding["template_id"] for binding in bindings})}}
+            ).to_list(length=None)
+        }
+        bindings = [
+            {
+                **binding,
+                "category": templates[binding["template_id"]].get("category"),
+                "slots": template_slots(templates[binding["template_id"]]),
+                "revision": template_revision(templates[binding["template_id"]])
+            }
+            for binding in bindings
+            if binding["template_id"] in templates
+        ]
+    template_bindings.set(user_id, bindings, generation)
+    return bindings
+
+async def get_template_day(user_id: str, year: int, month: int, date: int) -> Optional[Dict[str, Any]]:
+    """The day as its template binding would fill it, or None if no binding covers it or it is not a date"""
+    bindings = await get_template_bindings(user_id)
+    if not bindings:
+        return None
+    try:
+        day = Date(year, month, date)
+    except ValueError:
+        return None
+    binding = binding_for_day(bindings, day)
+    return template_day(user_id, day, binding) if binding else None
+
+async def get_day_or_template(user_id: str, year: int, month: int, date: int) -> Optional[Dict[str, Any]]:
+    """The stored day, else the day from its template binding. Callers must not mutate the result."""
+    doc = await get_calendar_document(user_id, year, month, date)
+    if doc is None:
+        doc = await get_template_day(user_id, year, month, date)
+    return doc
+
+async def materialize_template_day(user_id: str, year: int, month: int, date: int) -> None:
+    """
+    Store a template day's slots before a slot-level write changes them. The
+    stored day keeps `template` and no version, so it carries the template
+    day's ETag until it is written. Users without a binding covering the day
+    (the common case, answered from the bindings cache) cost no database read.
+    """
+    doc = await get_template_day(user_id, year, month, date)
+    if doc is None:
+        return
+    if await get_calendar_document(user_id, year, month, date) is not None:
+        return
+    db = get_database()
+    now = datetime.utcnow()
+    stored = {key: value for key, value in doc.items() if key != "_id"}
+    try:
+        result = await db[COLLECTION_NAME].update_one(
+            day_filter(user_id, year, month, date),
+            {"$setOnInsert": {**stored, "created_at": now, "updated_at": now}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        return
+    finally:
+        invalidate_day(user_id, year, month, date)
+    if result.upserted_id is not None:
+        await day_written(user_id, year, month, date, {**stored, "_id": result.upserted_id, "updated_at": now})
+
+def replace_slots_update(
+    year: int,
+    month: int,
+    date: int,
+    slots: List[Dict[str, Any]],
+    now: datetime
+) -> Dict[str, Any]:
+    """Update document that replaces a day's slots, shared by single-day and bulk writes"""
+    return {
+        "$set": {
+            "slots": slots,
+            "day_key": day_key(year, month, date),
+            "schema_version": SCHEMA_VERSION,
+            "updated_at": now
+        },
+        "$setOnInsert": {
+            "created_at": now
+        },
+        # A replaced day no longer comes from a template
+        "$unset": {
+            "template": ""
         },
+        "$inc": {
+            "version": 1
+        }
+    }
+
+async def upsert_calendar_document(
+    user_id: str,
+    year: int,
+    month: int,
+    date: int,
+    slots: List[Dict[str, Any]],
+    precondition: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Replace a day's slots and return the stored day. With a precondition
+    (see if_match_filter) returns None instead of writing when it doesn't hold.
+    """
+    db = get_database()
+    try:
+        doc = await db[COLLECTION_NAME].find_one_and_update(
+            {**day_filter(user_id, year, month, date), **(precondition or {})},
+            replace_slots_update(year, month, date, slots, datetime.utcnow()),
+            upsert=allows_insert(precondition),
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # "none" precondition, but the day was created in the meantime
+        return None
+    finally:
+        invalidate_day(user_id, year, month, date)
+    if doc:
+        await day_written(user_id, year, month, date, doc)
+    return doc
+
+async def update_slot_task(
+    user_id: str,
+    year: int,
+    month: int,
+    date: int,
+    time_slot: str,
+    fields: Dict[str, Any],
+    require_task: bool = False,
+    precondition: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Set fields on a single slot in place with a filtered positional update, so
+    the slots array never round-trips through the application. Keys in
+    `fields` are relative to the slot, e.g. {"task": {...}} or {"task.status": "completed"}.
+    Returns the updated day, or None when no slot with that time_slot (and a
+    task, if required) exists or the precondition (see if_match_filter) fails.
+    """
+    db = get_database()
+    await materialize_template_day(user_id, year, month, date)
+    day_query = {**day_filter(user_id, year, month, date), **(precondition or {})}
+    element = {"time_slot": time_slot}
+    if require_task:
+        element["task"] = {"$ne": None}
+
+    doc = await db[COLLECTION_NAME].find_one_and_update(
+        {**day_query, "slots": {"$elemMatch": element}},
         {
             "$set": {
-                "slots": slots,
+                **{f"slots.$[slot].{key}": value for key, value in fields.items()},
+                "day_key": day_key(year, month, date),
                 "updated_at": datetime.utcnow()
             },
-            "$setOnInsert": {
-                "created_at": datetime.utcnow()
-            }
+            "$inc": {"version": 1}
         },
-        upsert=True
+        array_filters=[{f"slot.{key}": value for key, value in element.items()}],
+        return_document=ReturnDocument.AFTER
+    )
+    invalidate_day(user_id, year, month, date)
+    if doc:
+        await day_written(user_id, year, month, date, doc)
+    if doc or require_task:
+        return doc
+
+    # Legacy documents store bare time slot strings; replace the element with the canonical shape
+    slot = {"time_slot": time_slot, "task": fields.get("task"), "interval": slot_interval(time_slot)}
+    doc = await db[COLLECTION_NAME].find_one_and_update(
+        {**day_query, "slots": time_slot},
+        {"$set": {"slots.$": slot, "day_key": day_key(year, month, date), "updated_at": datetime.utcnow()}, "$inc": {"version": 1}},
+        return_document=ReturnDocument.AFTER
     )
+    invalidate_day(user_id, year, month, date)
+    if doc:
+        await day_written(user_id, year, month, date, doc)
+    return doc
 
 @router.post(
     "/optimize-schedule",
@@ -224,12 +962,12 @@ def optimize_schedule(request: ScheduleOptimizationRequest) -> ScheduleOptimizat
         )
 
 @router.get("/health")
-def health_check():
+async def health_check():
     try:
         if mongodb.database is None:
             return {"status": "error", "message": "Database not connected"}
         
-        mongodb.client.admin.command('ping')
+        await mongodb.client.admin.command('ping')
         return {
             "status": "healthy", 
             "message": "MongoDB connection is working",
@@ -245,46 +983,118 @@ def health_check():
     "/slots/{user_id}/{year}/{month}/{date}",
     response_model=SlotResponse,
     responses={
+        304: {"description": "Not modified since the ETag in If-None-Match"},
         404: {"model": ErrorResponse, "description": "Slots not found"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-def get_slots(
+async def get_slots(
     user_id: str, 
     year: int, 
     month: int, 
-    date: int
+    date: int,
+    request: Request
 ) -> SlotResponse:
-    """Get slots with tasks for a specific user and date"""
+    """Get slots with tasks for a specific user and date, filled from a template binding if none are stored"""
     try:
-        doc = get_calendar_document(user_id, year, month, date)
+        doc = await get_day_or_template(user_id, year, month, date)
         
-        if not doc:
-            return SlotResponse(
-                user_id=user_id,
-                year=year,
-                month=month,
-                date=date,
-                slots=[],
-                total_slots=0
-            )
+        etag = day_etag(doc)
+        not_modified = not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
         
-        raw_slots = doc.get("slots", [])
-        slots = convert_legacy_slots(raw_slots)        
-        non_empty_slots = [slot for slot in slots if slot.time_slot.strip()]
+        slots = stored_slots(doc) if doc else []
+        non_empty_slots = [slot for slot in slots if slot["time_slot"].strip()]
         
-        return SlotResponse(
+        return FastJSONResponse(
+            {
+                "user_id": user_id,
+                "year": year,
+                "month": month,
+                "date": date,
+                "slots": non_empty_slots,
+                "total_slots": len(non_empty_slots),
+                "template": doc.get("template") if doc else None
+            },
+            headers=etag_headers(etag)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving slots: {str(e)}"
+        )
+
+async def get_interval_index(user_id: str, year: int, month: int, date: int):
+    """
+    Slots of a day, stored or from its template, with an interval index over
+    them, rebuilt only when the day's ETag changes
+    """
+    doc = await get_day_or_template(user_id, year, month, date)
+    if not doc:
+        return [], IntervalIndex([])
+    key = (user_id, year, month, date)
+    etag = day_etag(doc)
+    cached = interval_indexes.get(key)
+    if cached is not MISSING and cached[0] == etag:
+        return cached[1], cached[2]
+    slots = normalize_slot_dicts(stored_slots(doc))
+    index = IntervalIndex.from_slots(slots)
+    interval_indexes.set(key, (etag, slots, index))
+    return slots, index
+
+@router.get(
+    "/slots/{user_id}/{year}/{month}/{date}/at",
+    response_model=SlotLookupResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Unparseable time or time slot"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def lookup_slots(
+    user_id: str,
+    year: int,
+    month: int,
+    date: int,
+    time: Optional[str] = Query(None, description="Time of day, e.g. 14:30 or 2:30 PM"),
+    time_slot: Optional[str] = Query(None, description="Time range to check for overlaps, e.g. 14:00-15:00")
+) -> SlotLookupResponse:
+    """
+    Slots covering a time of day, or overlapping a time range, on a stored or
+    template day. Slots that cross midnight cover both the end and the start
+    of the day.
+    """
+    if bool(time) == bool(time_slot):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pass exactly one of time or time_slot"
+        )
+    try:
+        if time:
+            start = parse_time(time)
+            end = start + 1
+        else:
+            start, end = parse_time_slot(time_slot)
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(ve)
+        )
+    
+    try:
+        slots, index = await get_interval_index(user_id, year, month, date)
+        return SlotLookupResponse(
             user_id=user_id,
             year=year,
             month=month,
             date=date,
-            slots=non_empty_slots,
-            total_slots=len(non_empty_slots)
+            query=time or time_slot,
+            slots=[slots[position] for position in index.overlapping(start, end)]
         )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error retrieving slots: {str(e)}"
+            detail=f"Error looking up slots: {str(e)}"
         )
 
 @router.post(
@@ -292,51 +1102,77 @@ def get_slots(
     response_model=SlotCreateResponse,
     responses={
         400: {"model": ErrorResponse, "description": "Invalid date or data"},
+        409: {"model": VersionConflictResponse, "description": "New slots overlap stored slots, or If-Match does not match the stored day"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-def create_slots(
+async def create_slots(
     user_id: str, 
     year: int, 
     month: int, 
     date: int, 
-    slot_data: SlotUpdate
+    slot_data: SlotUpdate,
+    request: Request,
+    response: Response
 ) -> SlotCreateResponse:
-    """Create or add slots with tasks for a specific date"""
+    """
+    Create or add slots with tasks for a specific date. Slots whose time_slot is
+    already stored are skipped; slots overlapping a different stored slot are
+    rejected with 409 and nothing is written. With If-Match the write only
+    applies to that version of the day.
+    """
     try:
         # Validate date
         datetime(year, month, date)
         
-        # Get existing document
-        existing_doc = get_calendar_document(user_id, year, month, date)
-        existing_slots = []
-        
-        if existing_doc:
-            existing_raw_slots = existing_doc.get("slots", [])
-            existing_slots = convert_legacy_slots(existing_raw_slots)
+        # Convert new slots to dict format for storage, keeping the first of any repeated time slot
+        new_slots_dict = first_per_time_slot(slots_to_dicts(slot_data.slots))
         
-        # Convert new slots to dict format for storage
-        new_slots_dict = []
-        for slot in slot_data.slots:
-            slot_dict = {
-                "time_slot": slot.time_slot,
-                "task": slot.task.dict() if slot.task else None
-            }
-            new_slots_dict.append(slot_dict)
-        
-        # Combine existing and new slots (avoid duplicates by time_slot)
-        existing_time_slots = {slot.time_slot for slot in existing_slots}
-        combined_slots = [slot.dict() for slot in existing_slots]
-        
-        for new_slot in new_slots_dict:
-            if new_slot["time_slot"] not in existing_time_slots:
-                combined_slots.append(new_slot)
-        
-        # Save to database
-        upsert_calendar_document(user_id, year, month, date, combined_slots)
+        # Check against the stored day, then merge server-side only if the day is
+        # still at the version that was checked; otherwise re-read and check again.
+        # A client-supplied If-Match pins the version instead, without retries.
+        db = get_database()
+        precondition = if_match_filter(request)
+        await materialize_template_day(user_id, year, month, date)
+        doc = None
+        try:
+            for attempt in range(MERGE_ATTEMPTS if precondition is None else 1):
+                if attempt == 0 and precondition is None:
+                    current = await get_calendar_document(user_id, year, month, date)
+                else:
+                    current = await db[COLLECTION_NAME].find_one(day_filter(user_id, year, month, date))
+                if precondition is not None and not if_match_holds(request, current):
+                    return await version_conflict(user_id, year, month, date)
+                conflicts = slot_conflicts(current.get("slots", []) if current else [], new_slots_dict)
+                if conflicts:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail=f"Time slots overlap stored slots: {', '.join(conflicts)}"
+                    )
+                try:
+                    doc = await db[COLLECTION_NAME].find_one_and_update(
+                        {**day_filter(user_id, year, month, date), **(precondition or version_guard(current))},
+                        merge_slots_pipeline(new_slots_dict, day_key(year, month, date), datetime.utcnow()),
+                        upsert=allows_insert(precondition),
+                        return_document=ReturnDocument.AFTER
+                    )
+                    if doc is not None:
+                        break
+                except DuplicateKeyError:
+                    continue
+        finally:
+            invalidate_day(user_id, year, month, date)
+        if doc is None and precondition is not None:
+            return await version_conflict(user_id, year, month, date)
+        if doc is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The day kept changing while slots were being added, retry the request"
+            )
+        await day_written(user_id, year, month, date, doc)
         
-        # Convert back to response format
-        response_slots = convert_legacy_slots(combined_slots)
+        response_slots = normalize_slot_dicts(doc.get("slots", []))
+        response.headers["ETag"] = day_etag(doc)
         
         return SlotCreateResponse(
             message="Slots created successfully",
@@ -346,6 +1182,8 @@ def create_slots(
             date=date,
             slots=response_slots
         )
+    except HTTPException:
+        raise
     except ValueError as ve:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -364,49 +1202,37 @@ def create_slots(
     responses={
         400: {"model": ErrorResponse, "description": "Invalid data"},
         404: {"model": ErrorResponse, "description": "Slot not found"},
+        409: {"model": VersionConflictResponse, "description": "If-Match does not match the stored day"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-def assign_task_to_slot(
+async def assign_task_to_slot(
     user_id: str, 
     year: int, 
     month: int, 
     date: int, 
     time_slot: str,
-    task_data: TaskUpdate
+    task_data: TaskUpdate,
+    request: Request,
+    response: Response
 ) -> TaskAssignResponse:
     """Assign a task to a specific time slot"""
     try:
-        doc = get_calendar_document(user_id, year, month, date)
+        doc = await update_slot_task(
+            user_id, year, month, date, time_slot, {"task": task_data.task.dict()},
+            precondition=if_match_filter(request)
+        )
         
         if not doc:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Date not found in calendar"
-            )
-        
-        raw_slots = doc.get("slots", [])
-        slots = convert_legacy_slots(raw_slots)
-        
-        # Find the slot and assign task
-        slot_found = False
-        updated_slots = []
-        
-        for slot in slots:
-            if slot.time_slot == time_slot:
-                slot.task = task_data.task
-                slot_found = True
-            updated_slots.append(slot.dict())
-        
-        if not slot_found:
+            conflict = await missing_or_conflict(request, user_id, year, month, date)
+            if conflict:
+                return conflict
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Time slot '{time_slot}' not found"
             )
         
-        # Update in database
-        upsert_calendar_document(user_id, year, month, date, updated_slots)
-        
+        response.headers["ETag"] = day_etag(doc)
         return TaskAssignResponse(
             message="Task assigned successfully",
             user_id=user_id,
@@ -424,97 +1250,473 @@ def assign_task_to_slot(
             detail=f"Error assigning task: {str(e)}"
         )
 
-# GET endpoint - Search tasks by status or priority
-@router.get(
-    "/tasks/{user_id}",
-    response_model=TaskSearchResponse,
+# PATCH endpoint - Change the status of a slot's task
+@router.patch(
+    "/slots/{user_id}/{year}/{month}/{date}/{time_slot}/task",
+    response_model=TaskStatusResponse,
     responses={
+        404: {"model": ErrorResponse, "description": "Slot or task not found"},
+        409: {"model": VersionConflictResponse, "description": "If-Match does not match the stored day"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-def search_tasks(
+async def update_task_status(
     user_id: str,
-    status: Optional[str] = None,
-    priority: Optional[str] = None,
-    year: Optional[int] = None,
-    month: Optional[int] = None
-) -> TaskSearchResponse:
-    """Search tasks by various criteria"""
+    year: int,
+    month: int,
+    date: int,
+    time_slot: str,
+    status_data: TaskStatusUpdate,
+    request: Request,
+    response: Response
+) -> TaskStatusResponse:
+    """Change the status of the task assigned to a time slot"""
     try:
-        db = get_database()
-        
-        # Build query
-        query = {"user_id": user_id}
-        if year:
-            query["year"] = year
-        if month:
-            query["month"] = month
+        doc = await update_slot_task(
+            user_id, year, month, date, time_slot,
+            {"task.status": status_data.status},
+            require_task=True,
+            precondition=if_match_filter(request)
+        )
         
-        # Get all matching documents
-        documents = list(db[COLLECTION_NAME].find(query))
-        
-        tasks = []
-        
-        for doc in documents:
-            raw_slots = doc.get("slots", [])
-            slots = convert_legacy_slots(raw_slots)
-            
-            for slot in slots:
-                if slot.task:
-                    # Apply filters
-                    if status and slot.task.status != status:
-                        continue
-                    if priority and slot.task.priority != priority:
-                        continue
-                        
-                    tasks.append({
-                        "date": f"{doc['year']}-{str(doc['month']).zfill(2)}-{str(doc['date']).zfill(2)}",
-                        "time_slot": slot.time_slot,
-                        "task": slot.task.dict()
-                    })
+        if not doc:
+            conflict = await missing_or_conflict(request, user_id, year, month, date)
+            if conflict:
+                return conflict
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No task assigned to time slot '{time_slot}'"
+            )
+        
+        response.headers["ETag"] = day_etag(doc)
+        return TaskStatusResponse(
+            message="Task status updated successfully",
+            user_id=user_id,
+            year=year,
+            month=month,
+            date=date,
+            time_slot=time_slot,
+            status=status_data.status
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error updating task status: {str(e)}"
+        )
+
+# DELETE endpoint - Remove the task from a slot, keeping the slot
+@router.delete(
+    "/slots/{user_id}/{year}/{month}/{date}/{time_slot}/task",
+    response_model=TaskClearResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Slot not found"},
+        409: {"model": VersionConflictResponse, "description": "If-Match does not match the stored day"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def clear_slot_task(
+    user_id: str,
+    year: int,
+    month: int,
+    date: int,
+    time_slot: str,
+    request: Request,
+    response: Response
+) -> TaskClearResponse:
+    """Remove the task assigned to a time slot"""
+    try:
+        doc = await update_slot_task(
+            user_id, year, month, date, time_slot, {"task": None},
+            precondition=if_match_filter(request)
+        )
+        
+        if not doc:
+            conflict = await missing_or_conflict(request, user_id, year, month, date)
+            if conflict:
+                return conflict
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Time slot '{time_slot}' not found"
+            )
+        
+        response.headers["ETag"] = day_etag(doc)
+        return TaskClearResponse(
+            message="Task cleared successfully",
+            user_id=user_id,
+            year=year,
+            month=month,
+            date=date,
+            time_slot=time_slot
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error clearing task: {str(e)}"
+        )
+
+# GET endpoint - Search tasks by status or priority
+@router.get(
+    "/tasks/{user_id}",
+    response_model=TaskSearchResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def search_tasks(
+    user_id: str,
+    task_status: Optional[str] = Query(None, alias="status"),
+    priority: Optional[str] = None,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    from_date: Optional[Date] = Query(None, description="First day to include (YYYY-MM-DD)"),
+    to_date: Optional[Date] = Query(None, description="Last day to include (YYYY-MM-DD)"),
+    page_size: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, deprecated=True, description="Use page_size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    view: Literal["full", "compact"] = Query("full", description="compact returns task_id, title, status and priority only"),
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return, overrides view")
+) -> TaskSearchResponse:
+    """Search tasks by various criteria"""
+    try:
+        db = get_database()
+        task_fields = resolve_task_fields(view, fields)
+        page_size = page_size or limit or DEFAULT_PAGE_SIZE
+        
+        if await tasks_collection_ready(user_id):
+            return await search_task_documents(
+                user_id, task_status, priority, year, month, from_date, to_date,
+                page_size, cursor, task_fields
+            )
+        
+        # Day-level filters run against the calendar index before any array is unwound
+        day_clauses = []
+        query = {"user_id": user_id}
+        if year:
+            query["year"] = year
+        if month:
+            query["month"] = month
+        if from_date:
+            day_clauses.append(days_on_or_after(from_date.year, from_date.month, from_date.day))
+        if to_date:
+            day_clauses.append(days_on_or_before(to_date.year, to_date.month, to_date.day))
+        
+        # Keyset position: (year, month, date) of the last returned task and its slot index
+        after = None
+        if cursor:
+            after = decode_cursor(cursor, 4)
+            day_clauses.append(days_on_or_after(after[0], after[1], after[2]))
+        if day_clauses:
+            query["$and"] = day_clauses
+        
+        # Task filters also narrow the days up front, on the status/priority indexes
+        task_match = {}
+        if task_status:
+            task_match["task.status"] = task_status
+        if priority:
+            task_match["task.priority"] = priority
+        if task_match:
+            query["slots"] = {"$elemMatch": task_match}
+        
+        slot_query = {"slots.task": {"$type": "object"}}
+        if task_status:
+            slot_query["slots.task.status"] = task_status
+        if priority:
+            slot_query["slots.task.priority"] = priority
+        if after:
+            slot_query["$nor"] = [{
+                "year": after[0],
+                "month": after[1],
+                "date": after[2],
+                "slot_index": {"$lte": after[3]}
+            }]
+        
+        pipeline = [
+            {"$match": query},
+            {"$sort": {"year": 1, "month": 1, "date": 1}},
+            {"$unwind": {"path": "$slots", "includeArrayIndex": "slot_index"}},
+            {"$match": slot_query},
+            {"$limit": page_size + 1},
+            {"$project": {
+                "_id": 0,
+                "year": 1,
+                "month": 1,
+                "date": 1,
+                "slot_index": 1,
+                "time_slot": "$slots.time_slot",
+                "task": (
+                    {field: f"$slots.task.{field}" for field in task_fields}
+                    if task_fields is not None else "$slots.task"
+                )
+            }}
+        ]
+        rows = await db[COLLECTION_NAME].aggregate(pipeline).to_list(length=None)
+        
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_cursor = encode_cursor([last["year"], last["month"], last["date"], last["slot_index"]])
+        
+        tasks = [
+            {
+                "date": f"{row['year']}-{str(row['month']).zfill(2)}-{str(row['date']).zfill(2)}",
+                "time_slot": row["time_slot"],
+                "task": row["task"]
+            }
+            for row in rows
+        ]
         
         return TaskSearchResponse(
             user_id=user_id,
-            tasks=tasks
+            tasks=tasks,
+            page_size=page_size,
+            next_cursor=next_cursor
         )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching tasks: {str(e)}"
+        )
+
+async def search_task_documents(
+    user_id: str,
+    task_status: Optional[str],
+    priority: Optional[str],
+    year: Optional[int],
+    month: Optional[int],
+    from_date: Optional[Date],
+    to_date: Optional[Date],
+    page_size: int,
+    cursor: Optional[str],
+    task_fields: Optional[List[str]]
+) -> TaskSearchResponse:
+    """search_tasks against the tasks collection: one index range scan, same results and cursors"""
+    db = get_database()
+    query = {"user_id": user_id}
+    if task_status:
+        query["status"] = task_status
+    if priority:
+        query["priority"] = priority
+    if year:
+        query["year"] = year
+    if month:
+        query["month"] = month
+    
+    day_range = {}
+    if from_date:
+        day_range["$gte"] = day_key(from_date.year, from_date.month, from_date.day)
+    if to_date:
+        day_range["$lte"] = day_key(to_date.year, to_date.month, to_date.day)
+    if day_range:
+        query["day_key"] = day_range
+    
+    # Keyset position: (year, month, date) of the last returned task and its slot index
+    if cursor:
+        after = decode_cursor(cursor, 4)
+        after_key = day_key(after[0], after[1], after[2])
+        query["$or"] = [
+            {"day_key": {"$gt": after_key}},
+            {"day_key": after_key, "slot_index": {"$gt": after[3]}}
+        ]
+    
+    projection = {"_id": 0, "year": 1, "month": 1, "date": 1, "time_slot": 1, "slot_index": 1}
+    projection.update({field: 1 for field in (task_fields or TASK_FIELDS)})
+    rows = await (
+        db[TASKS_COLLECTION]
+        .find(query, projection)
+        .sort([("day_key", 1), ("slot_index", 1)])
+        .limit(page_size + 1)
+        .to_list(length=None)
+    )
+    
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor([last["year"], last["month"], last["date"], last["slot_index"]])
+    
+    return TaskSearchResponse(
+        user_id=user_id,
+        tasks=[task_response(row, task_fields) for row in rows],
+        page_size=page_size,
+        next_cursor=next_cursor
+    )
+
+async def get_search_index(user_id: str) -> InvertedIndex:
+    """Cached inverted index over all of a user's tasks"""
+    index = search_indexes.get(user_id)
+    if index is not MISSING:
+        return index
+    
+    generation = search_indexes.generation
+    db = get_database()
+    if await tasks_collection_ready(user_id):
+        rows = await db[TASKS_COLLECTION].find(
+            {"user_id": user_id},
+            {"_id": 0, "day_id": 0, "day_updated_at": 0}
+        ).to_list(length=None)
+    else:
+        rows = []
+        async for doc in db[COLLECTION_NAME].find({"user_id": user_id, "slots.task": {"$type": "object"}}):
+            rows.extend(task_rows(user_id, doc["year"], doc["month"], doc["date"], doc, doc.get("updated_at")))
+    index = InvertedIndex(rows)
+    search_indexes.set(user_id, index, generation)
+    return index
+
+async def text_index_search(user_id: str, q: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+    """Ranked rows from the user_task_text index, or None where $text is unavailable"""
+    if (
+        TEXT_SEARCH_BACKEND == "local"
+        or time.monotonic() - mongodb.text_search_failed_at < TEXT_SEARCH_RECHECK_SECONDS
+        or not await tasks_collection_ready(user_id)
+    ):
+        return None
+    db = get_database()
+    try:
+        return await (
+            db[TASKS_COLLECTION]
+            .find(
+                {"user_id": user_id, "$text": {"$search": q}},
+                {"_id": 0, "day_id": 0, "day_updated_at": 0, "score": {"$meta": "textScore"}}
+            )
+            .sort([("score", {"$meta": "textScore"})])
+            .limit(limit)
+            .to_list(length=None)
+        )
+    except OperationFailure as e:
+        print(f"Text search unavailable, using the in-process index: {e}")
+        mongodb.text_search_failed_at = time.monotonic()
+        return None
+
+# GET endpoint - Full-text search over task titles and descriptions
+@router.get(
+    "/tasks/{user_id}/search",
+    response_model=TaskTextSearchResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def search_task_text(
+    user_id: str,
+    q: str = Query(..., min_length=1, description="Words to look for in task titles and descriptions"),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS)
+) -> TaskTextSearchResponse:
+    """Tasks whose title or description match the query, best match first"""
+    try:
+        rows = await text_index_search(user_id, q, limit)
+        if rows is not None:
+            backend = "text_index"
+            results = [(row, row["score"]) for row in rows]
+        else:
+            backend = "inverted_index"
+            results = (await get_search_index(user_id)).search(q, limit)
+        
+        return FastJSONResponse({
+            "user_id": user_id,
+            "query": q,
+            "backend": backend,
+            "results": [
+                {**task_response(row), "score": round(score, 4)}
+                for row, score in results
+            ]
+        })
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error searching tasks: {str(e)}"
         )
 
+# GET endpoint - Find a task by id
+@router.get(
+    "/tasks/{user_id}/{task_id}",
+    response_model=TaskLookupResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Task not found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_task(user_id: str, task_id: str) -> TaskLookupResponse:
+    """Every slot a task is assigned to, in date order"""
+    try:
+        db = get_database()
+        if await tasks_collection_ready(user_id):
+            rows = await (
+                db[TASKS_COLLECTION]
+                .find({"user_id": user_id, "task_id": task_id})
+                .sort([("day_key", 1), ("slot_index", 1)])
+                .to_list(length=None)
+            )
+        else:
+            rows = await db[COLLECTION_NAME].aggregate([
+                {"$match": {"user_id": user_id, "slots.task.task_id": task_id}},
+                {"$sort": {"year": 1, "month": 1, "date": 1}},
+                {"$unwind": "$slots"},
+                {"$match": {"slots.task.task_id": task_id}},
+                {"$replaceRoot": {"newRoot": {"$mergeObjects": [
+                    "$slots.task",
+                    {"year": "$year", "month": "$month", "date": "$date", "time_slot": "$slots.time_slot"}
+                ]}}}
+            ]).to_list(length=None)
+        
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Task '{task_id}' not found"
+            )
+        
+        return TaskLookupResponse(
+            user_id=user_id,
+            task_id=task_id,
+            occurrences=[task_response(row) for row in rows]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving task: {str(e)}"
+        )
+
 # PUT endpoint - Update/Replace slots for a date
 @router.put(
     "/slots/{user_id}/{year}/{month}/{date}",
     response_model=SlotUpdateResponse,
     responses={
         400: {"model": ErrorResponse, "description": "Invalid date or data"},
+        409: {"model": VersionConflictResponse, "description": "If-Match does not match the stored day"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-def update_slots(
+async def update_slots(
     user_id: str, 
     year: int, 
     month: int, 
     date: int, 
-    slot_data: SlotUpdate
+    slot_data: SlotUpdate,
+    request: Request,
+    response: Response
 ) -> SlotUpdateResponse:
-    """Update/Replace slots for a specific date"""
+    """Update/Replace slots for a specific date, only at the If-Match version if one is sent"""
     try:
         # Validate date
         datetime(year, month, date)
         
         # Convert slots to dict format for storage
-        slots_dict = []
-        for slot in slot_data.slots:
-            slot_dict = {
-                "time_slot": slot.time_slot,
-                "task": slot.task.dict() if slot.task else None
-            }
-            slots_dict.append(slot_dict)
+        slots_dict = slots_to_dicts(slot_data.slots)
         
         # Update in database
-        upsert_calendar_document(user_id, year, month, date, slots_dict)
+        doc = await upsert_calendar_document(
+            user_id, year, month, date, slots_dict, precondition=if_match_filter(request)
+        )
+        if doc is None:
+            return await version_conflict(user_id, year, month, date)
+        response.headers["ETag"] = day_etag(doc)
         
         return SlotUpdateResponse(
             message="Slots updated successfully",
@@ -522,8 +1724,10 @@ def update_slots(
             year=year,
             month=month,
             date=date,
-            slots=slot_data.slots
+            slots=normalize_slot_dicts(doc.get("slots", []))
         )
+    except HTTPException:
+        raise
     except ValueError as ve:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -535,37 +1739,247 @@ def update_slots(
             detail=f"Error updating slots: {str(e)}"
         )
 
+# POST endpoint - Fetch many days at once
+@router.post(
+    "/slots/batch",
+    response_model=SlotBatchResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid date or too many keys"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_slots_batch(batch: SlotBatchRequest) -> SlotBatchResponse:
+    """
+    Slots of several days, for one or more users, with one query for all of
+    them. Each result is what GET /slots returns for its key, in request
+    order; days with nothing stored or templated come back empty with found=false.
+    """
+    if len(batch.keys) > MAX_BATCH_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_KEYS} keys per request"
+        )
+    keys = [(ref.user_id, ref.year, ref.month, ref.date) for ref in batch.keys]
+    for index, (_, year, month, date) in enumerate(keys):
+        try:
+            Date(year, month, date)
+        except ValueError as ve:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid date in keys[{index}]: {str(ve)}"
+            )
+    
+    try:
+        documents = await get_calendar_documents(keys)
+        for key, doc in documents.items():
+            if doc is None:
+                documents[key] = await get_template_day(*key)
+        
+        days = []
+        for user_id, year, month, date in keys:
+            doc = documents[(user_id, year, month, date)]
+            slots = [slot for slot in stored_slots(doc) if slot["time_slot"].strip()] if doc else []
+            days.append({
+                "user_id": user_id,
+                "year": year,
+                "month": month,
+                "date": date,
+                "slots": slots,
+                "total_slots": len(slots),
+                "template": doc.get("template") if doc else None,
+                "found": doc is not None,
+                "etag": day_etag(doc)
+            })
+        return FastJSONResponse({"days": days})
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving slots: {str(e)}"
+        )
+
+# POST endpoint - Write slots for many dates at once
+@router.post(
+    "/slots/{user_id}/bulk",
+    response_model=BulkSlotResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid data"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def bulk_write_slots(
+    user_id: str,
+    bulk_data: BulkSlotUpdate
+) -> BulkSlotResponse:
+    """
+    Replace (mode=replace, same as PUT) or merge (mode=merge, same as POST)
+    slots for many dates in a single unordered bulk write. One failing day
+    does not stop the others; each day's outcome is reported. Merged days
+    whose slots overlap stored slots fail without being written, and merging
+    into a template day stores the template's slots too.
+    """
+    if len(bulk_data.days) > MAX_BULK_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_DAYS} days per request"
+        )
+    dates = [day.date for day in bulk_data.days]
+    if len(set(dates)) != len(dates):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each date may appear only once per request"
+        )
+    
+    try:
+        db = get_database()
+        now = datetime.utcnow()
+        
+        stored = {}
+        bindings = []
+        if bulk_data.mode == "merge":
+            bindings = await get_template_bindings(user_id)
+            # By full day identity, so days stored before day_key existed are found too
+            async for doc in db[COLLECTION_NAME].find(
+                {"$or": [day_filter(user_id, d.year, d.month, d.day) for d in dates]},
+                {"year": 1, "month": 1, "date": 1, "slots": 1, "version": 1}
+            ):
+                stored[day_key(doc["year"], doc["month"], doc["date"])] = doc
+        
+        errors = {}
+        operations = []
+        operation_days = []
+        for index, day in enumerate(bulk_data.days):
+            year, month, date = day.date.year, day.date.month, day.date.day
+            key = day_key(year, month, date)
+            slots_dict = slots_to_dicts(day.slots)
+            day_query = day_filter(user_id, year, month, date)
+            if bulk_data.mode == "merge":
+                slots_dict = first_per_time_slot(slots_dict)
+                current = stored.get(key)
+                binding = binding_for_day(bindings, day.date) if current is None else None
+                if binding:
+                    # Same as a single-day POST: the template's slots are stored along with the new ones
+                    current = template_day(user_id, day.date, binding)
+                conflicts = slot_conflicts(current.get("slots", []) if current else [], slots_dict)
+                if conflicts:
+                    errors[index] = f"Time slots overlap stored slots: {', '.join(conflicts)}"
+                    continue
+                if binding:
+                    template_times = {slot["time_slot"] for slot in current["slots"]}
+                    update = replace_slots_update(year, month, date, current["slots"] + [
+                        slot for slot in slots_dict if slot["time_slot"] not in template_times
+                    ], now)
+                    day_query.update(MUST_NOT_EXIST)
+                else:
+                    update = merge_slots_pipeline(slots_dict, key, now)
+                    day_query.update(version_guard(current))
+            else:
+                update = replace_slots_update(year, month, date, slots_dict, now)
+            operations.append(UpdateOne(day_query, update, upsert=True))
+            operation_days.append(index)
+        
+        try:
+            if operations:
+                await db[COLLECTION_NAME].bulk_write(operations, ordered=False)
+        except BulkWriteError as bwe:
+            for write_error in bwe.details.get("writeErrors", []):
+                index = operation_days[write_error["index"]]
+                if write_error.get("code") == 11000 and bulk_data.mode == "merge":
+                    errors[index] = "Day changed during the bulk write, retry it"
+                else:
+                    errors[index] = write_error.get("errmsg", "Write failed")
+        finally:
+            for day in bulk_data.days:
+                invalidate_day(user_id, day.date.year, day.date.month, day.date.day)
+        
+        # Read back the written days in one query for the derived data
+        written = [day for index, day in enumerate(bulk_data.days) if index not in errors]
+        if written:
+            await days_written(user_id, await db[COLLECTION_NAME].find({
+                "user_id": user_id,
+                "day_key": {"$in": [day_key(d.date.year, d.date.month, d.date.day) for d in written]}
+            }).to_list(length=None))
+        
+        results = [
+            BulkSlotDayResult(
+                date=day.date.isoformat(),
+                success=index not in errors,
+                error=errors.get(index)
+            )
+            for index, day in enumerate(bulk_data.days)
+        ]
+        
+        return BulkSlotResponse(
+            message="Bulk write completed" if not errors else "Bulk write completed with errors",
+            user_id=user_id,
+            mode=bulk_data.mode,
+            succeeded=len(results) - len(errors),
+            failed=len(errors),
+            results=results
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error writing slots: {str(e)}"
+        )
+
 # DELETE endpoint - Delete slots for a date
 @router.delete(
     "/slots/{user_id}/{year}/{month}/{date}",
     response_model=SlotDeleteResponse,
     responses={
+        400: {"model": ErrorResponse, "description": "Invalid date"},
         404: {"model": ErrorResponse, "description": "Slots not found"},
+        409: {"model": VersionConflictResponse, "description": "If-Match does not match the stored day"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-def delete_slots(
+async def delete_slots(
     user_id: str, 
     year: int, 
     month: int, 
-    date: int
+    date: int,
+    request: Request,
+    response: Response,
+    keep_empty: bool = Query(
+        False,
+        description="Store the day with no slots instead of removing it, so a template binding no longer fills it"
+    )
 ) -> SlotDeleteResponse:
-    """Delete all slots for a specific date"""
+    """Delete all slots for a specific date, only at the If-Match version if one is sent"""
     try:
         db = get_database()
         
-        result = db[COLLECTION_NAME].delete_one({
-            "user_id": user_id,
-            "year": year,
-            "month": month,
-            "date": date
-        })
+        if keep_empty:
+            datetime(year, month, date)
+            doc = await upsert_calendar_document(
+                user_id, year, month, date, [], precondition=if_match_filter(request)
+            )
+            if doc is None:
+                return await version_conflict(user_id, year, month, date)
+            response.headers["ETag"] = day_etag(doc)
+            return SlotDeleteResponse(
+                message="Slots cleared successfully",
+                user_id=user_id,
+                year=year,
+                month=month,
+                date=date
+            )
+        
+        deleted = await db[COLLECTION_NAME].find_one_and_delete(
+            {**day_filter(user_id, year, month, date), **(if_match_filter(request) or {})},
+            projection={"_id": 1}
+        )
+        invalidate_day(user_id, year, month, date)
         
-        if result.deleted_count == 0:
+        if deleted is None:
+            conflict = await missing_or_conflict(request, user_id, year, month, date)
+            if conflict:
+                return conflict
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No slots found for the specified date"
             )
+        await day_written(user_id, year, month, date, None, deleted_id=deleted["_id"])
         
         return SlotDeleteResponse(
             message="Slots deleted successfully",
@@ -576,83 +1990,732 @@ def delete_slots(
         )
     except HTTPException:
         raise
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid date: {str(ve)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting slots: {str(e)}"
         )
 
+async def stream_user_calendar(user_id: str, task_fields: Optional[List[str]]) -> StreamingResponse:
+    """
+    Stream a user's calendar as NDJSON straight off the cursor, one day per
+    line in the same shape as the days of the JSON response
+    """
+    projected = task_fields is not None and await slots_canonical()
+    cursor = (
+        get_database()[COLLECTION_NAME]
+        .find({"user_id": user_id}, day_projection(task_fields) if projected else None)
+        .sort([("year", 1), ("month", 1), ("date", 1)])
+        .batch_size(STREAM_BATCH_SIZE)
+    )
+
+    async def lines():
+        async for doc in cursor:
+            if task_fields is not None and not projected:
+                doc = trim_day(doc, task_fields)
+            yield dumps(day_response_dict(doc, projected=task_fields is not None)) + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
 # GET endpoint - Get all data for a user
 @router.get(
     "/user/{user_id}",
     response_model=UserCalendarResponse,
     responses={
+        200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "JSON, or NDJSON when requested via Accept"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-def get_user_calendar(user_id: str) -> UserCalendarResponse:
-    """Get all calendar data for a specific user"""
+async def get_user_calendar(
+    user_id: str,
+    request: Request,
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    view: Literal["full", "compact"] = Query("full", description="compact returns task_id, title, status and priority only"),
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return, overrides view")
+) -> UserCalendarResponse:
+    """Get calendar data for a specific user, one page of days at a time"""
     try:
-        db = get_database()
+        task_fields = resolve_task_fields(view, fields)
+        if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            return await stream_user_calendar(user_id, task_fields)
         
-        documents = list(db[COLLECTION_NAME].find({"user_id": user_id}))
-        
-        # Convert ObjectId to string for JSON serialization
-        calendar_data = []
-        for doc in documents:
-            doc["_id"] = str(doc["_id"])
-            calendar_data.append(doc)
+        # Keyset on (year, month, date): every page is one bounded index range scan
+        query = {"user_id": user_id}
+        if cursor:
+            query.update(days_after(*decode_cursor(cursor, 3)))
         
-        return UserCalendarResponse(
-            user_id=user_id,
-            calendar=calendar_data
+        documents = await find_days(
+            query, task_fields, sort=[("year", 1), ("month", 1), ("date", 1)], limit=page_size + 1
         )
+        
+        next_cursor = None
+        if len(documents) > page_size:
+            documents = documents[:page_size]
+            last = documents[-1]
+            next_cursor = encode_cursor([last["year"], last["month"], last["date"]])
+        
+        return FastJSONResponse({
+            "user_id": user_id,
+            "calendar": [day_response_dict(doc, projected=task_fields is not None) for doc in documents],
+            "page_size": page_size,
+            "next_cursor": next_cursor
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving user calendar: {str(e)}"
         )
 
+# GET endpoint - Stream all data for a user as NDJSON
+@router.get(
+    "/user/{user_id}/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "One calendar day per line"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_user_calendar_stream(
+    user_id: str,
+    view: Literal["full", "compact"] = Query("full", description="compact returns task_id, title, status and priority only"),
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return, overrides view")
+) -> StreamingResponse:
+    """Stream all calendar data for a specific user, one day per line"""
+    try:
+        return await stream_user_calendar(user_id, resolve_task_fields(view, fields))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error streaming user calendar: {str(e)}"
+        )
+
 # GET endpoint - Get month view
 @router.get(
     "/month/{user_id}/{year}/{month}",
     response_model=MonthCalendarResponse,
     responses={
+        304: {"description": "Not modified since the ETag in If-None-Match"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-def get_month_calendar(
+async def get_month_calendar(
     user_id: str, 
     year: int, 
-    month: int
+    month: int,
+    request: Request,
+    view: Literal["full", "compact"] = Query("full", description="compact returns task_id, title, status and priority only"),
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return, overrides view")
 ) -> MonthCalendarResponse:
-    """Get all slots for a specific month"""
+    """Get all slots for a specific month, with days of template bindings that have no stored slots"""
+    try:
+        task_fields = resolve_task_fields(view, fields)
+        documents = await get_month_documents(user_id, year, month, task_fields)
+        bindings = await get_template_bindings(user_id)
+        if bindings and 1 <= month <= 12 and MINYEAR <= year <= MAXYEAR:
+            bound = template_days(
+                user_id, bindings,
+                Date(year, month, 1), Date(year, month, calendar.monthrange(year, month)[1]),
+                {day_key(year, month, doc["date"]) for doc in documents}
+            )
+            documents = sorted(
+                documents + [{**doc, "slots": project_slots(doc["slots"], task_fields)} for doc in bound],
+                key=lambda doc: doc["date"]
+            )
+        
+        etag = month_etag(documents, ",".join(task_fields) if task_fields is not None else "")
+        not_modified = not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
+        
+        return FastJSONResponse(
+            {
+                "user_id": user_id,
+                "year": year,
+                "month": month,
+                "dates": [day_response_dict(doc, projected=task_fields is not None) for doc in documents]
+            },
+            headers=etag_headers(etag)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving month data: {str(e)}"
+        )
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the day and month read caches and the interval and search indexes"""
+    return {
+        "day": day_cache.stats(),
+        "month": month_cache.stats(),
+        "intervals": interval_indexes.stats(),
+        "search": search_indexes.stats(),
+        "templates": template_bindings.stats(),
+        "push": change_hub.stats()
+    }
+
+# GET endpoint - Get an arbitrary date range
+@router.get(
+    "/range/{user_id}",
+    response_model=RangeCalendarResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid date range"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_range_calendar(
+    user_id: str,
+    from_date: Date = Query(..., alias="from", description="First day (YYYY-MM-DD)"),
+    to_date: Date = Query(..., alias="to", description="Last day, inclusive (YYYY-MM-DD)")
+) -> RangeCalendarResponse:
+    """Get all slots between two dates, across month and year boundaries"""
+    if to_date < from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'"
+        )
+    if (to_date - from_date).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days"
+        )
     try:
         db = get_database()
         
-        documents = list(db[COLLECTION_NAME].find({
+        # One range scan on the (user_id, day_key) index
+        documents = await db[COLLECTION_NAME].find({
             "user_id": user_id,
-            "year": year,
-            "month": month
-        }))
-        
-        # Convert to response format
-        month_data = []
-        for doc in documents:
-            doc["_id"] = str(doc["_id"])
-            raw_slots = doc.get("slots", [])
-            slots = convert_legacy_slots(raw_slots)
-            doc["slots"] = [slot.dict() for slot in slots]
-            month_data.append(doc)
-        
-        return MonthCalendarResponse(
+            "day_key": {
+                "$gte": day_key(from_date.year, from_date.month, from_date.day),
+                "$lte": day_key(to_date.year, to_date.month, to_date.day)
+            }
+        }).sort("day_key", 1).to_list(length=None)
+        bindings = await get_template_bindings(user_id)
+        if bindings:
+            bound = template_days(
+                user_id, bindings, from_date, to_date,
+                {day_key(doc["year"], doc["month"], doc["date"]) for doc in documents}
+            )
+            documents = sorted(documents + bound, key=lambda doc: (doc["year"], doc["month"], doc["date"]))
+        
+        return FastJSONResponse({
+            "user_id": user_id,
+            "from_date": from_date.isoformat(),
+            "to_date": to_date.isoformat(),
+            "dates": [day_response_dict(doc) for doc in documents]
+        })
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving date range: {str(e)}"
+        )
+
+def time_window(start: int, end: int) -> Dict[str, Any]:
+    return {"start": format_minutes(start), "end": format_minutes(end), "minutes": end - start}
+
+# GET endpoint - Free and busy windows over a date range
+@router.get(
+    "/freebusy/{user_id}",
+    response_model=FreeBusyResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid date range or time"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_free_busy(
+    user_id: str,
+    from_date: Date = Query(..., alias="from", description="First day (YYYY-MM-DD)"),
+    to_date: Date = Query(..., alias="to", description="Last day, inclusive (YYYY-MM-DD)"),
+    min_minutes: int = Query(1, ge=1, le=MINUTES_PER_DAY, description="Shortest free window to return"),
+    day_start: str = Query("00:00", description="Only look for free time from this time of day"),
+    day_end: str = Query("24:00", description="Only look for free time until this time of day")
+) -> FreeBusyResponse:
+    """
+    Merged busy windows and the free gaps between them for every day in a
+    range. Busy time comes from the stored slot intervals; a slot crossing
+    midnight is busy until midnight on its own day and from midnight on the
+    next, so the day before the range is read as well.
+    """
+    if to_date < from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'"
+        )
+    if (to_date - from_date).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days"
+        )
+    try:
+        window_start = parse_time(day_start)
+        window_end = MINUTES_PER_DAY if day_end.strip() == "24:00" else parse_time(day_end)
+    except ValueError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(ve)
+        )
+    if window_end <= window_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="day_end must be after day_start"
+        )
+    
+    try:
+        db = get_database()
+        
+        # One range scan on the (user_id, day_key) index. Slots are fetched whole:
+        # a sub-field projection would drop legacy bare-string slots.
+        first_day = from_date - timedelta(days=1)
+        segments_by_day: Dict[Date, List[Tuple[int, int]]] = {}
+        async for doc in db[COLLECTION_NAME].find(
+            {
+                "user_id": user_id,
+                "day_key": {
+                    "$gte": day_key(first_day.year, first_day.month, first_day.day),
+                    "$lte": day_key(to_date.year, to_date.month, to_date.day)
+                }
+            },
+            {"_id": 0, "year": 1, "month": 1, "date": 1, "slots": 1}
+        ):
+            stored_day = Date(doc["year"], doc["month"], doc["date"])
+            for slot in normalize_slot_dicts(doc.get("slots", [])):
+                if slot["interval"]:
+                    for offset, start, end in day_segments(slot["interval"]["start"], slot["interval"]["end"]):
+                        segments_by_day.setdefault(stored_day + timedelta(days=offset), []).append((start, end))
+        
+        days = []
+        day = from_date
+        while day <= to_date:
+            busy = merge_intervals(segments_by_day.get(day, []))
+            days.append({
+                "date": day.isoformat(),
+                "busy": [time_window(start, end) for start, end in busy],
+                "free": [
+                    time_window(start, end)
+                    for start, end in free_gaps(busy, window_start, window_end, min_minutes)
+                ]
+            })
+            day += timedelta(days=1)
+        
+        return FastJSONResponse({
+            "user_id": user_id,
+            "from_date": from_date.isoformat(),
+            "to_date": to_date.isoformat(),
+            "min_minutes": min_minutes,
+            "days": days
+        })
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error computing free/busy: {str(e)}"
+        )
+
+# GET endpoint - Task counts for a month
+@router.get(
+    "/stats/{user_id}/{year}/{month}",
+    response_model=MonthStatsResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_month_stats(
+    user_id: str,
+    year: int,
+    month: int
+) -> MonthStatsResponse:
+    """Slot and task counts per status and priority for a month, from the maintained stats document"""
+    try:
+        db = get_database()
+        doc = await db[STATS_COLLECTION].find_one(
+            {"user_id": user_id, "year": year, "month": month},
+            {"_id": 0, "totals": 1, "days": 1, "updated_at": 1}
+        )
+        doc = doc or {}
+        days = {
+            date: {key: value for key, value in counts.items() if key != "updated_at"}
+            for date, counts in doc.get("days", {}).items()
+            if counts.get("slots")
+        }
+        
+        return MonthStatsResponse(
             user_id=user_id,
             year=year,
             month=month,
-            dates=month_data
+            totals={**empty_totals(), **doc.get("totals", {})},
+            days=days,
+            updated_at=doc.get("updated_at")
         )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error retrieving month data: {str(e)}"
-        )
\ No newline at end of file
+            detail=f"Error retrieving month stats: {str(e)}"
+        )
+
+def decode_sync_position(time_value: Any, id_value: Any) -> Tuple[datetime, Optional[ObjectId]]:
+    try:
+        return datetime.fromisoformat(time_value), ObjectId(id_value) if id_value else None
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token"
+        )
+
+def after_sync_position(field: str, position: Tuple[datetime, Optional[ObjectId]]) -> Dict[str, Any]:
+    changed_at, last_id = position
+    if last_id is None:
+        return {field: {"$gt": changed_at}}
+    return {"$or": [{field: {"$gt": changed_at}}, {field: changed_at, "_id": {"$gt": last_id}}]}
+
+def next_sync_position(
+    rows: List[Dict[str, Any]],
+    field: str,
+    position: Tuple[datetime, Optional[ObjectId]],
+    full_page: bool,
+    cutoff: datetime
+) -> Tuple[datetime, Optional[ObjectId]]:
+    """
+    Where the next request resumes: right after the last row while paging,
+    but never past `cutoff` once caught up, so late commits are not skipped.
+    Rows between the cutoff and the last row are sent again; applying a
+    change twice is harmless.
+    """
+    last = (rows[-1][field], rows[-1]["_id"]) if rows else position
+    if full_page or last[0] <= cutoff:
+        return last
+    return max(position[0], cutoff), None
+
+# GET endpoint - Days changed or deleted since a sync token
+@router.get(
+    "/changes/{user_id}",
+    response_model=ChangesResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid sync token"},
+        410: {"model": ErrorResponse, "description": "Sync token older than the deletion history, resync from scratch"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def get_changes(
+    user_id: str,
+    since: Optional[str] = Query(None, description="next_token from the previous call; omit for a full sync"),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+) -> ChangesResponse:
+    """
+    Days written and days deleted since a token, oldest change first. Apply
+    `deleted` before `days`, and remove a local day only if its _id matches
+    the deletion's day_id. Keep calling with next_token while has_more.
+    """
+    now = datetime.utcnow()
+    if since:
+        token = decode_cursor(since, 4)
+        days_position = decode_sync_position(*token[:2])
+        deleted_position = decode_sync_position(*token[2:])
+        if (now - deleted_position[0]).total_seconds() > TOMBSTONE_RETENTION_SECONDS:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Sync token has expired, start again without since"
+            )
+    else:
+        # A fresh client needs every day but no deletions
+        days_position = (datetime(1970, 1, 1), None)
+        deleted_position = (now, None)
+    
+    try:
+        db = get_database()
+        days = await (
+            db[COLLECTION_NAME]
+            .find({"user_id": user_id, **after_sync_position("updated_at", days_position)})
+            .sort([("updated_at", 1), ("_id", 1)])
+            .limit(page_size + 1)
+            .to_list(length=None)
+        )
+        deleted = await (
+            db[TOMBSTONES_COLLECTION]
+            .find({"user_id": user_id, **after_sync_position("deleted_at", deleted_position)})
+            .sort([("deleted_at", 1), ("_id", 1)])
+            .limit(page_size + 1)
+            .to_list(length=None)
+        )
+        more_days = len(days) > page_size
+        more_deleted = len(deleted) > page_size
+        days, deleted = days[:page_size], deleted[:page_size]
+        
+        cutoff = now - timedelta(seconds=SYNC_LAG_SECONDS)
+        days_position = next_sync_position(days, "updated_at", days_position, more_days, cutoff)
+        deleted_position = next_sync_position(deleted, "deleted_at", deleted_position, more_deleted, cutoff)
+        next_token = encode_cursor([
+            days_position[0].isoformat(), str(days_position[1]) if days_position[1] else None,
+            deleted_position[0].isoformat(), str(deleted_position[1]) if deleted_position[1] else None
+        ])
+        
+        return FastJSONResponse({
+            "user_id": user_id,
+            "days": [day_response_dict(doc) for doc in days],
+            "deleted": [
+                {
+                    "date": f"{row['year']}-{str(row['month']).zfill(2)}-{str(row['date']).zfill(2)}",
+                    "day_id": str(row["day_id"]),
+                    "deleted_at": row["deleted_at"]
+                }
+                for row in deleted
+            ],
+            "next_token": next_token,
+            "has_more": more_days or more_deleted
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving changes: {str(e)}"
+        )
+
+async def next_event(queue: asyncio.Queue) -> Optional[Dict[str, Any]]:
+    """The next queued event, or None after PUSH_HEARTBEAT_SECONDS of quiet"""
+    try:
+        return await asyncio.wait_for(queue.get(), PUSH_HEARTBEAT_SECONDS)
+    except asyncio.TimeoutError:
+        return None
+
+# WebSocket endpoint - Push day change events
+@router.websocket("/ws/{user_id}")
+async def calendar_updates_ws(websocket: WebSocket, user_id: str):
+    """
+    Sends a JSON event each time one of the user's days is written or deleted,
+    and {"type": "ping"} when nothing happened for a while. Messages from the
+    client are ignored. After (re)connecting, catch up with GET /changes.
+    """
+    await websocket.accept()
+    async with change_hub.subscribe(user_id) as queue:
+        # Reading is the only way to notice a client that went away quietly
+        closed = asyncio.create_task(websocket.receive())
+        try:
+            await websocket.send_json({"type": "ready"})
+            while True:
+                event = asyncio.create_task(next_event(queue))
+                await asyncio.wait({event, closed}, return_when=asyncio.FIRST_COMPLETED)
+                if closed.done():
+                    if closed.result()["type"] == "websocket.disconnect":
+                        event.cancel()
+                        break
+                    closed = asyncio.create_task(websocket.receive())
+                if event.done():
+                    await websocket.send_json(event.result() or {"type": "ping"})
+                else:
+                    event.cancel()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            closed.cancel()
+
+def sse_message(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+# GET endpoint - Push day change events as Server-Sent Events
+@router.get(
+    "/events/{user_id}",
+    responses={200: {"content": {SSE_MEDIA_TYPE: {}}, "description": "Event stream of day changes"}}
+)
+async def calendar_updates_sse(user_id: str, request: Request) -> StreamingResponse:
+    """
+    Same events as the WebSocket endpoint as an event stream, named by their
+    type, with a comment line as heartbeat. After (re)connecting, catch up
+    with GET /changes.
+    """
+    async def messages():
+        async with change_hub.subscribe(user_id) as queue:
+            yield sse_message({"type": "ready"})
+            while not await request.is_disconnected():
+                event = await next_event(queue)
+                yield sse_message(event) if event else ": ping\n\n"
+
+    return StreamingResponse(
+        messages(),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def binding_response(binding: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "binding_id": str(binding["_id"]),
+        "user_id": binding["user_id"],
+        "template_id": str(binding["template_id"]),
+        "category": binding.get("category"),
+        "start": binding["start"],
+        "end": binding["end"],
+        "weekdays": binding["weekdays"]
+    }
+
+def bindings_changed(user_id: str) -> None:
+    """Template days of the user may all have changed; connected clients refetch"""
+    template_bindings.invalidate(user_id)
+    change_hub.publish(user_id, RESYNC_EVENT)
+
+# GET endpoint - Available schedule templates
+@router.get(
+    "/templates",
+    response_model=TemplateListResponse,
+    responses={500: {"model": ErrorResponse, "description": "Internal server error"}}
+)
+async def list_templates() -> TemplateListResponse:
+    """Weekly schedule templates a user can bind to a date range"""
+    try:
+        db = get_database()
+        templates = await db[TEMPLATES_COLLECTION].find(
+            {"schedule": {"$exists": True}},
+            {"category": 1, "day": 1, "description": 1, "schedule.time_slot": 1}
+        ).to_list(length=None)
+        return TemplateListResponse(templates=[
+            {
+                "template_id": str(template["_id"]),
+                "category": template.get("category", ""),
+                "day": template.get("day", ""),
+                "description": template.get("description"),
+                "weekdays": template_weekdays(template.get("day", "")),
+                "total_slots": len(template.get("schedule", []))
+            }
+            for template in templates
+        ])
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving templates: {str(e)}"
+        )
+
+# POST endpoint - Bind a template to a date range
+@router.post(
+    "/templates/{user_id}/bindings",
+    response_model=TemplateBindingResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid range or weekdays"},
+        404: {"model": ErrorResponse, "description": "Template not found"},
+        409: {"model": ErrorResponse, "description": "Overlaps another binding on the same weekdays"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def create_template_binding(user_id: str, binding_data: TemplateBindingCreate) -> TemplateBindingResponse:
+    """
+    Fill the given weekdays between start and end from a template. Nothing is
+    copied: days without stored slots are read from the template, and
+    writing a day overrides it.
+    """
+    if binding_data.end < binding_data.start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'end' must not be before 'start'"
+        )
+    try:
+        db = get_database()
+        template = None
+        if ObjectId.is_valid(binding_data.template_id):
+            template = await db[TEMPLATES_COLLECTION].find_one(
+                {"_id": ObjectId(binding_data.template_id)},
+                {"category": 1, "day": 1}
+            )
+        if template is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Template {binding_data.template_id} not found"
+            )
+        weekdays = binding_data.weekdays or template_weekdays(template.get("day", ""))
+        if not weekdays:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Template '{template.get('category')}' is not tied to weekdays, pass weekdays"
+            )
+        
+        start, end = binding_data.start, binding_data.end
+        binding = {
+            "user_id": user_id,
+            "template_id": template["_id"],
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "start_key": day_key(start.year, start.month, start.day),
+            "end_key": day_key(end.year, end.month, end.day),
+            "weekdays": weekdays,
+            "created_at": datetime.utcnow()
+        }
+        existing = await db[BINDINGS_COLLECTION].find(
+            {"user_id": user_id, "start_key": {"$lte": binding["end_key"]}, "end_key": {"$gte": binding["start_key"]}}
+        ).to_list(length=None)
+        overlapping = [other for other in existing if bindings_overlap(binding, other)]
+        if overlapping:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Overlaps binding {overlapping[0]['_id']} ({overlapping[0]['start']} to {overlapping[0]['end']})"
+            )
+        
+        result = await db[BINDINGS_COLLECTION].insert_one(binding)
+        bindings_changed(user_id)
+        return TemplateBindingResponse(**binding_response(
+            {**binding, "_id": result.inserted_id, "category": template.get("category")}
+        ))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating template binding: {str(e)}"
+        )
+
+# GET endpoint - A user's template bindings
+@router.get(
+    "/templates/{user_id}/bindings",
+    response_model=TemplateBindingsResponse,
+    responses={500: {"model": ErrorResponse, "description": "Internal server error"}}
+)
+async def list_template_bindings(user_id: str) -> TemplateBindingsResponse:
+    """Every template binding of a user, in start order"""
+    try:
+        bindings = await get_template_bindings(user_id)
+        return TemplateBindingsResponse(
+            user_id=user_id,
+            bindings=[binding_response(binding) for binding in bindings]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving template bindings: {str(e)}"
+        )
+
+# DELETE endpoint - Remove a template binding
+@router.delete(
+    "/templates/{user_id}/bindings/{binding_id}",
+    responses={
+        404: {"model": ErrorResponse, "description": "Binding not found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def delete_template_binding(user_id: str, binding_id: str):
+    """Stop filling days from a template; days already stored are kept"""
+    try:
+        db = get_database()
+        result = None
+        if ObjectId.is_valid(binding_id):
+            result = await db[BINDINGS_COLLECTION].delete_one({"_id": ObjectId(binding_id), "user_id": user_id})
+        if result is None or result.deleted_count == 0:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Binding {binding_id} not found"
+            )
+        bindings_changed(user_id)
+        return {"message": "Template binding deleted", "user_id": user_id, "binding_id": binding_id}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error deleting template binding: {str(e)}"
+        )
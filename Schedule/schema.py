@@ -1,8 +1,13 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Dict, Any, Optional, List, Annotated
-from datetime import datetime
+from typing import Dict, Any, Optional, List, Literal, Annotated
+from datetime import datetime, date as date_type
 from bson import ObjectId
 
+from .intervals import find_overlaps
+
+ALLOWED_PRIORITIES = ["low", "medium", "high", "urgent"]
+ALLOWED_STATUSES = ["pending", "in_progress", "completed", "cancelled"]
+
 class PyObjectId(ObjectId):    
     @classmethod
     def __get_pydantic_core_schema__(cls, source_type, handler):
@@ -37,22 +42,25 @@ class Task(BaseModel):
     @field_validator('priority')
     @classmethod
     def validate_priority(cls, v):
-        allowed_priorities = ["low", "medium", "high", "urgent"]
-        if v and v not in allowed_priorities:
-            raise ValueError(f"Priority must be one of: {allowed_priorities}")
+        if v and v not in ALLOWED_PRIORITIES:
+            raise ValueError(f"Priority must be one of: {ALLOWED_PRIORITIES}")
         return v
     
     @field_validator('status')
     @classmethod
     def validate_status(cls, v):
-        allowed_statuses = ["pending", "in_progress", "completed", "cancelled"]
-        if v and v not in allowed_statuses:
-            raise ValueError(f"Status must be one of: {allowed_statuses}")
+        if v and v not in ALLOWED_STATUSES:
+            raise ValueError(f"Status must be one of: {ALLOWED_STATUSES}")
         return v
 
+class SlotInterval(BaseModel):
+    start: int = Field(..., description="Start in minutes from midnight", example=540)
+    end: int = Field(..., description="End in minutes from midnight, past 1440 for overnight slots", example=600)
+
 class SlotWithTask(BaseModel):
     time_slot: str = Field(..., description="Time slot", example="09:00-10:00")
     task: Optional[Task] = Field(None, description="Assigned task for this slot")
+    interval: Optional[SlotInterval] = Field(None, description="Parsed time_slot, computed by the server")
 
 class SlotUpdate(BaseModel):
     slots: List[SlotWithTask] = Field(
@@ -84,8 +92,21 @@ class SlotUpdate(BaseModel):
         for slot_data in v:
             if not slot_data.time_slot.strip():
                 raise ValueError("Time slot cannot be empty")
+        overlaps = find_overlaps([slot_data.time_slot for slot_data in v])
+        if overlaps:
+            raise ValueError(f"Time slots overlap: {', '.join(f'{a} / {b}' for a, b in overlaps)}")
         return v
 
+class BulkSlotDay(SlotUpdate):
+    date: date_type = Field(..., description="Calendar date (YYYY-MM-DD)", example="2025-08-15")
+
+class BulkSlotUpdate(BaseModel):
+    mode: Literal["replace", "merge"] = Field(
+        "replace",
+        description="replace overwrites each day's slots, merge appends slots whose time_slot is new"
+    )
+    days: List[BulkSlotDay] = Field(..., description="Slots to write per date", min_length=1)
+
 class SimpleSlotUpdate(BaseModel):
     slots: List[str] = Field(
         ..., 
@@ -96,6 +117,16 @@ class SimpleSlotUpdate(BaseModel):
 class TaskUpdate(BaseModel):
     task: Task = Field(..., description="Task to assign to the slot")
 
+class TaskStatusUpdate(BaseModel):
+    status: str = Field(..., description="New task status", example="completed")
+
+    @field_validator('status')
+    @classmethod
+    def validate_status(cls, v):
+        if v not in ALLOWED_STATUSES:
+            raise ValueError(f"Status must be one of: {ALLOWED_STATUSES}")
+        return v
+
 # MongoDB Document Schemas
 class CalendarDocument(BaseModel):
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
@@ -157,13 +188,32 @@ class SlotResponse(BaseModel):
         ]
     )
     total_slots: int = Field(..., description="Total number of slots", example=2)
+    template: Optional[Dict[str, Any]] = Field(None, description="template_id, binding_id and revision when the slots come from a template binding")
+
+class DayRef(BaseModel):
+    user_id: str = Field(..., description="User ID", example="user_123")
+    year: int = Field(..., description="Year", example=2025)
+    month: int = Field(..., description="Month", example=8)
+    date: int = Field(..., description="Date", example=15)
+
+class SlotBatchRequest(BaseModel):
+    keys: List[DayRef] = Field(..., description="Days to fetch, in the order results are wanted", min_length=1)
+
+class SlotBatchDay(SlotResponse):
+    found: bool = Field(..., description="False for a day with no stored slots and no template")
+    etag: str = Field(..., description="ETag of the day, as GET /slots returns it", example='"66b1f0c2a4e5d6f7a8b9c0d1-4"')
+
+class SlotBatchResponse(BaseModel):
+    days: List[SlotBatchDay] = Field(default=[], description="One entry per requested key, in request order")
 
 class UserCalendarResponse(BaseModel):
     user_id: str = Field(..., description="User ID", example="user_123")
     calendar: List[Dict[str, Any]] = Field(
         default=[], 
-        description="User's complete calendar data"
+        description="One page of the user's calendar data, ordered by day"
     )
+    page_size: int = Field(..., description="Maximum number of days per page", example=100)
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
 
 class MonthCalendarResponse(BaseModel):
     user_id: str = Field(..., description="User ID", example="user_123")
@@ -174,6 +224,15 @@ class MonthCalendarResponse(BaseModel):
         description="Month's calendar data"
     )
 
+class RangeCalendarResponse(BaseModel):
+    user_id: str = Field(..., description="User ID", example="user_123")
+    from_date: str = Field(..., description="First day of the range", example="2025-08-28")
+    to_date: str = Field(..., description="Last day of the range", example="2025-09-10")
+    dates: List[Dict[str, Any]] = Field(
+        default=[], 
+        description="Calendar data for every stored day in the range, in date order"
+    )
+
 class SlotCreateResponse(BaseModel):
     message: str = Field(..., description="Success message", example="Slots created successfully")
     user_id: str = Field(..., description="User ID", example="user_123")
@@ -201,6 +260,159 @@ class TaskAssignResponse(BaseModel):
     time_slot: str = Field(..., description="Time slot", example="09:00-10:00")
     task: Task = Field(..., description="Assigned task")
 
+class TaskStatusResponse(BaseModel):
+    """Schema for task status change response"""
+    message: str = Field(..., description="Success message", example="Task status updated successfully")
+    user_id: str = Field(..., description="User ID", example="user_123")
+    year: int = Field(..., description="Year", example=2025)
+    month: int = Field(..., description="Month", example=8)
+    date: int = Field(..., description="Date", example=15)
+    time_slot: str = Field(..., description="Time slot", example="09:00-10:00")
+    status: str = Field(..., description="New task status", example="completed")
+
+class TaskClearResponse(BaseModel):
+    """Schema for task removal response"""
+    message: str = Field(..., description="Success message", example="Task cleared successfully")
+    user_id: str = Field(..., description="User ID", example="user_123")
+    year: int = Field(..., description="Year", example=2025)
+    month: int = Field(..., description="Month", example=8)
+    date: int = Field(..., description="Date", example=15)
+    time_slot: str = Field(..., description="Time slot", example="09:00-10:00")
+
+class BulkSlotDayResult(BaseModel):
+    date: str = Field(..., description="Calendar date", example="2025-08-15")
+    success: bool = Field(..., description="Whether this day was written")
+    error: Optional[str] = Field(None, description="Error message when the write failed")
+
+class BulkSlotResponse(BaseModel):
+    """Schema for bulk slot write response"""
+    message: str = Field(..., description="Summary message", example="Bulk write completed")
+    user_id: str = Field(..., description="User ID", example="user_123")
+    mode: str = Field(..., description="Write mode used", example="replace")
+    succeeded: int = Field(..., description="Number of days written", example=7)
+    failed: int = Field(..., description="Number of days that failed", example=0)
+    results: List[BulkSlotDayResult] = Field(..., description="Per-day outcome, in request order")
+
+class SlotLookupResponse(BaseModel):
+    user_id: str = Field(..., description="User ID", example="user_123")
+    year: int = Field(..., description="Year", example=2025)
+    month: int = Field(..., description="Month", example=8)
+    date: int = Field(..., description="Date", example=15)
+    query: str = Field(..., description="Time or time slot looked up", example="14:30")
+    slots: List[SlotWithTask] = Field(default=[], description="Stored slots covering the query, in start order")
+
+class TimeWindow(BaseModel):
+    start: str = Field(..., description="Start time (HH:MM)", example="10:00")
+    end: str = Field(..., description="End time (HH:MM), 24:00 for the end of the day", example="11:30")
+    minutes: int = Field(..., description="Length in minutes", example=90)
+
+class FreeBusyDay(BaseModel):
+    date: str = Field(..., description="Calendar date", example="2025-08-15")
+    busy: List[TimeWindow] = Field(default=[], description="Merged busy windows")
+    free: List[TimeWindow] = Field(default=[], description="Free windows of at least min_minutes")
+
+class FreeBusyResponse(BaseModel):
+    user_id: str = Field(..., description="User ID", example="user_123")
+    from_date: str = Field(..., description="First day of the range", example="2025-08-11")
+    to_date: str = Field(..., description="Last day of the range", example="2025-08-17")
+    min_minutes: int = Field(..., description="Shortest free window returned", example=45)
+    days: List[FreeBusyDay] = Field(default=[], description="One entry per day in the range, in date order")
+
+class MonthStatsResponse(BaseModel):
+    user_id: str = Field(..., description="User ID", example="user_123")
+    year: int = Field(..., description="Year", example=2025)
+    month: int = Field(..., description="Month", example=8)
+    totals: Dict[str, Any] = Field(
+        ...,
+        description="Slot and task counts for the month, with tasks per status and per priority",
+        example={
+            "slots": 40,
+            "tasks": 31,
+            "status": {"pending": 20, "in_progress": 3, "completed": 8, "cancelled": 0},
+            "priority": {"low": 5, "medium": 16, "high": 9, "urgent": 1}
+        }
+    )
+    days: Dict[str, Dict[str, Any]] = Field(default={}, description="The same counts per day of the month that has slots")
+    updated_at: Optional[datetime] = Field(None, description="Time of the latest write counted")
+
+class TaskLookupResponse(BaseModel):
+    user_id: str = Field(..., description="User ID", example="user_123")
+    task_id: str = Field(..., description="Task ID", example="task_001")
+    occurrences: List[Dict[str, Any]] = Field(
+        default=[],
+        description="Every slot the task is assigned to, in date order, shaped like search results"
+    )
+
+class TaskTextSearchResponse(BaseModel):
+    user_id: str = Field(..., description="User ID", example="user_123")
+    query: str = Field(..., description="Search query", example="team meeting")
+    backend: Literal["text_index", "inverted_index"] = Field(
+        ..., description="MongoDB text index, or the in-process index where text indexes are unavailable"
+    )
+    results: List[Dict[str, Any]] = Field(
+        default=[],
+        description="Matching tasks with date and time slot, best match first",
+        example=[
+            {
+                "date": "2025-08-15",
+                "time_slot": "09:00-10:00",
+                "task": {"task_id": "task_001", "title": "Team Meeting", "description": "Weekly sync",
+                         "priority": "high", "status": "pending"},
+                "score": 3.25
+            }
+        ]
+    )
+
+class TemplateSummary(BaseModel):
+    template_id: str = Field(..., description="Template ID", example="66b1f0c2a4e5d6f7a8b9c0d1")
+    category: str = Field(..., description="Template name", example="Regular Weekdays")
+    day: str = Field(..., description="Days the template is meant for", example="Monday-Friday")
+    description: Optional[str] = Field(None, description="Template description")
+    weekdays: Optional[List[int]] = Field(None, description="Weekdays a binding uses by default (Monday is 0), null if it must name them", example=[0, 1, 2, 3, 4])
+    total_slots: int = Field(..., description="Number of slots in the template", example=11)
+
+class TemplateListResponse(BaseModel):
+    templates: List[TemplateSummary] = Field(default=[], description="Available templates")
+
+class TemplateBindingCreate(BaseModel):
+    template_id: str = Field(..., description="Template to apply", example="66b1f0c2a4e5d6f7a8b9c0d1")
+    start: date_type = Field(..., description="First day of the binding", example="2025-08-01")
+    end: date_type = Field(..., description="Last day of the binding, inclusive", example="2025-12-31")
+    weekdays: Optional[List[int]] = Field(None, description="Weekdays to fill, Monday is 0; defaults to the template's days", example=[0, 1, 2, 3, 4])
+
+    @field_validator('weekdays')
+    @classmethod
+    def validate_weekdays(cls, v):
+        if v is None:
+            return v
+        if not v or any(day not in range(7) for day in v):
+            raise ValueError("weekdays must be a non-empty list of numbers from 0 (Monday) to 6 (Sunday)")
+        return sorted(set(v))
+
+class TemplateBindingResponse(BaseModel):
+    binding_id: str = Field(..., description="Binding ID", example="66b1f0c2a4e5d6f7a8b9c0d2")
+    user_id: str = Field(..., description="User ID", example="user_123")
+    template_id: str = Field(..., description="Template ID", example="66b1f0c2a4e5d6f7a8b9c0d1")
+    category: Optional[str] = Field(None, description="Template name", example="Regular Weekdays")
+    start: str = Field(..., description="First day of the binding", example="2025-08-01")
+    end: str = Field(..., description="Last day of the binding", example="2025-12-31")
+    weekdays: List[int] = Field(..., description="Weekdays filled, Monday is 0", example=[0, 1, 2, 3, 4])
+
+class TemplateBindingsResponse(BaseModel):
+    user_id: str = Field(..., description="User ID", example="user_123")
+    bindings: List[TemplateBindingResponse] = Field(default=[], description="Bindings in start order")
+
+class ChangesResponse(BaseModel):
+    user_id: str = Field(..., description="User ID", example="user_123")
+    days: List[Dict[str, Any]] = Field(default=[], description="Days written since the token, as stored, oldest first")
+    deleted: List[Dict[str, Any]] = Field(
+        default=[],
+        description="Days deleted since the token: date, day_id of the removed document and deleted_at",
+        example=[{"date": "2025-08-15", "day_id": "66b1f0c2a4e5d6f7a8b9c0d1", "deleted_at": "2025-08-14T10:00:00"}]
+    )
+    next_token: str = Field(..., description="Pass as since on the next call")
+    has_more: bool = Field(..., description="More changes are waiting; call again right away with next_token")
+
 class SlotDeleteResponse(BaseModel):
     """Schema for slot deletion response"""
     message: str = Field(..., description="Success message", example="Slots deleted successfully")
@@ -209,6 +421,12 @@ class SlotDeleteResponse(BaseModel):
     month: int = Field(..., description="Month", example=8)
     date: int = Field(..., description="Date", example=15)
 
+class VersionConflictResponse(BaseModel):
+    """Schema for 409 responses to writes whose If-Match no longer holds"""
+    detail: str = Field(..., description="Error message", example="The day was modified since it was read")
+    etag: str = Field(..., description="Current ETag of the day, to send as If-Match on the retry", example='"66b1f0c2a4e5d6f7a8b9c0d1-4"')
+    current: Optional[Dict[str, Any]] = Field(None, description="The day as it is now, null if it no longer exists")
+
 class ErrorResponse(BaseModel):
     """Schema for error responses"""
     detail: str = Field(..., description="Error message", example="Invalid date provided")
@@ -232,4 +450,6 @@ class TaskSearchResponse(BaseModel):
                 }
             }
         ]
-    )
\ No newline at end of file
+    )
+    page_size: int = Field(..., description="Maximum number of tasks per page", example=100)
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+In-process full-text index over a user's tasks.
+
+Used for task search where MongoDB text indexes are unavailable (or disabled
+with CALENDAR_TEXT_SEARCH=local). Documents are task rows as stored in the
+tasks collection; title and description are tokenized and scored with BM25,
+title matches weighted higher, mirroring the weights of the user_task_text
+index.
+"""
+import heapq
+import math
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+FIELD_WEIGHTS = {"title": 10, "description": 2}
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to with".split()
+)
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class InvertedIndex:
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        self.rows: List[Dict[str, Any]] = list(rows)
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.lengths: List[float] = []
+        for position, row in enumerate(self.rows):
+            length = 0.0
+            for field, weight in FIELD_WEIGHTS.items():
+                for term in tokenize(row.get(field) or ""):
+                    posting = self.postings.setdefault(term, {})
+                    posting[position] = posting.get(position, 0.0) + weight
+                    length += weight
+            self.lengths.append(length)
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def search(self, query: str, limit: int) -> List[Tuple[Dict[str, Any], float]]:
+        """Best `limit` rows matching any query term, with their scores, highest first"""
+        scores: Dict[int, float] = {}
+        total = len(self.rows)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (total - len(posting) + 0.5) / (len(posting) + 0.5))
+            for position, frequency in posting.items():
+                length_ratio = self.lengths[position] / self.average_length if self.average_length else 1.0
+                scores[position] = scores.get(position, 0.0) + idf * frequency * (K1 + 1) / (
+                    frequency + K1 * (1 - B + B * length_ratio)
+                )
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(self.rows[position], score) for position, score in best]
@@ -0,0 +1,87 @@
+"""
+Helpers for the shape of stored slots.
+
+Documents stamped with the current SCHEMA_VERSION hold only canonical
+{"time_slot": str, "task": dict | None, "interval": dict | None} slots whose
+tasks were validated on the way in, so reads can hand them out as-is.
+Anything else goes through convert_legacy_slots.
+
+Version 3 added the parsed interval (see intervals.py).
+"""
+from typing import Any, Dict, List
+
+from .intervals import slot_interval
+from .schema import SlotWithTask, Task
+
+SCHEMA_VERSION = 3
+
+
+def convert_legacy_slots(slots: List[Any]) -> List[SlotWithTask]:
+    converted_slots = []
+    for slot in slots:
+        if isinstance(slot, str):
+            converted_slots.append(SlotWithTask(time_slot=slot, task=None))
+        elif isinstance(slot, dict):
+            if "time_slot" in slot:
+                task_data = slot.get("task")
+                task = Task(**task_data) if task_data else None
+                converted_slots.append(SlotWithTask(time_slot=slot["time_slot"], task=task))
+            else:
+                converted_slots.append(SlotWithTask(time_slot=slot.get("time_slot", ""), task=None))
+    return converted_slots
+
+
+def slots_to_dicts(slots: List[SlotWithTask]) -> List[Dict[str, Any]]:
+    """Storage format for validated request slots"""
+    return [
+        {
+            "time_slot": slot.time_slot,
+            "task": slot.task.dict() if slot.task else None,
+            "interval": slot_interval(slot.time_slot)
+        }
+        for slot in slots
+    ]
+
+
+def normalize_slot_dicts(slots: List[Any]) -> List[Dict[str, Any]]:
+    """Same shape as convert_legacy_slots but as plain dicts, without re-running the Task validators"""
+    normalized = []
+    for slot in slots:
+        if isinstance(slot, str):
+            normalized.append({"time_slot": slot, "task": None, "interval": slot_interval(slot)})
+        elif isinstance(slot, dict):
+            time_slot = slot.get("time_slot", "")
+            normalized.append({
+                "time_slot": time_slot,
+                "task": slot.get("task"),
+                "interval": slot.get("interval") or slot_interval(time_slot)
+            })
+    return normalized
+
+
+def stored_slots(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Slots of a stored day as response-ready dicts, validating only documents that predate SCHEMA_VERSION"""
+    if doc.get("schema_version") == SCHEMA_VERSION:
+        return doc.get("slots", [])
+    return slots_to_dicts(convert_legacy_slots(doc.get("slots", [])))
+
+
+def day_key(year: int, month: int, date: int) -> int:
+    """Sortable yyyymmdd integer stored on every day document for range queries"""
+    return year * 10000 + month * 100 + date
+
+
+TASK_FIELDS = ["task_id", "title", "description", "priority", "status"]
+COMPACT_TASK_FIELDS = ["task_id", "title", "status", "priority"]
+# Day-level fields every projected view keeps: identity, ordering and ETag inputs
+DAY_FIELDS = ["user_id", "year", "month", "date", "day_key", "version", "schema_version"]
+
+
+def day_projection(task_fields: List[str]) -> Dict[str, int]:
+    """MongoDB projection returning a day with only the given task fields on each slot"""
+    projection = {field: 1 for field in DAY_FIELDS}
+    projection["slots.time_slot"] = 1
+    projection["slots.interval"] = 1
+    for field in task_fields:
+        projection[f"slots.task.{field}"] = 1
+    return projection
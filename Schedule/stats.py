@@ -0,0 +1,127 @@
+"""
+Per-month task statistics, maintained incrementally on every day write.
+
+calendar_month_stats holds one document per user and month:
+
+    {
+        "user_id": ..., "year": ..., "month": ...,
+        "days":   {"15": {"slots": 4, "tasks": 3, "status": {...}, "priority": {...}, "updated_at": ...}},
+        "totals": {"slots": 40, "tasks": 31, "status": {...}, "priority": {...}}
+    }
+
+A write records the day's new counts with one pipeline update that adds
+(new - stored) for the day to every total and replaces the day entry, so
+recording the same day twice is a no-op. Updates carry the day's updated_at
+and are skipped if an entry from a later write is already stored, so
+out-of-order updates from concurrent workers can't roll the counts back.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from .schema import ALLOWED_PRIORITIES, ALLOWED_STATUSES
+from .slots import normalize_slot_dicts
+
+STATS_COLLECTION = "calendar_month_stats"
+
+COUNTER_PATHS = (
+    ["slots", "tasks"]
+    + [f"status.{value}" for value in ALLOWED_STATUSES]
+    + [f"priority.{value}" for value in ALLOWED_PRIORITIES]
+)
+EPOCH = datetime(1970, 1, 1)
+
+
+def day_counts(slots: List[Any]) -> Dict[str, Any]:
+    """Slot, task, status and priority counts for one day's slots"""
+    counts = {
+        "slots": 0,
+        "tasks": 0,
+        "status": {value: 0 for value in ALLOWED_STATUSES},
+        "priority": {value: 0 for value in ALLOWED_PRIORITIES},
+    }
+    for slot in normalize_slot_dicts(slots):
+        counts["slots"] += 1
+        task = slot["task"]
+        if not task:
+            continue
+        counts["tasks"] += 1
+        if task.get("status") in counts["status"]:
+            counts["status"][task["status"]] += 1
+        if task.get("priority") in counts["priority"]:
+            counts["priority"][task["priority"]] += 1
+    return counts
+
+
+def _counter(counts: Dict[str, Any], path: str) -> int:
+    value = counts
+    for part in path.split("."):
+        value = value[part]
+    return value
+
+
+def month_stats_pipeline(date: int, counts: Dict[str, Any], updated_at: datetime) -> List[Dict[str, Any]]:
+    """
+    Update pipeline recording one day's counts. Every expression in the stage
+    sees the document as it was before the update, so totals are adjusted by
+    the difference against the day entry being replaced.
+    """
+    day = f"days.{date}"
+    applies = {"$gte": [updated_at, {"$ifNull": [f"${day}.updated_at", EPOCH]}]}
+    stage: Dict[str, Any] = {}
+    for path in COUNTER_PATHS:
+        total = {"$ifNull": [f"$totals.{path}", 0]}
+        delta = {"$subtract": [_counter(counts, path), {"$ifNull": [f"${day}.{path}", 0]}]}
+        stage[f"totals.{path}"] = {"$cond": [applies, {"$add": [total, delta]}, total]}
+    stage[day] = {"$cond": [applies, {"$literal": {**counts, "updated_at": updated_at}}, f"${day}"]}
+    stage["updated_at"] = {"$cond": [applies, updated_at, "$updated_at"]}
+    return [{"$set": stage}]
+
+
+def day_stats_update(
+    user_id: str,
+    year: int,
+    month: int,
+    date: int,
+    doc: Optional[Dict[str, Any]],
+    updated_at: Optional[datetime] = None
+) -> UpdateOne:
+    """
+    Upsert recording the day as stored in `doc`, or as deleted if doc is None.
+    `updated_at` defaults to the document's, and to now for deletions.
+    """
+    slots = doc.get("slots", []) if doc else []
+    if updated_at is None:
+        updated_at = (doc.get("updated_at") or EPOCH) if doc else datetime.utcnow()
+    return UpdateOne(
+        {"user_id": user_id, "year": year, "month": month},
+        month_stats_pipeline(date, day_counts(slots), updated_at),
+        upsert=True
+    )
+
+
+async def record_day_stats(
+    db,
+    user_id: str,
+    year: int,
+    month: int,
+    date: int,
+    doc: Optional[Dict[str, Any]],
+    updated_at: Optional[datetime] = None
+) -> None:
+    await record_days_stats(db, [day_stats_update(user_id, year, month, date, doc, updated_at)])
+
+
+async def record_days_stats(db, updates: List[UpdateOne]) -> None:
+    """
+    Apply day_stats_update operations in one round trip. Ordered, so days of
+    the same month upsert one document instead of racing to create it.
+    """
+    if updates:
+        await db[STATS_COLLECTION].bulk_write(updates, ordered=True)
+
+
+def empty_totals() -> Dict[str, Any]:
+    counts = day_counts([])
+    return {key: counts[key] for key in ("slots", "tasks", "status", "priority")}
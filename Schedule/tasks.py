@@ -0,0 +1,189 @@
+"""
+Denormalized copy of every assigned task, one document per task and slot.
+
+calendar_data stays the source of truth; the tasks collection is rebuilt for a
+day after every write to it, so task queries are plain index lookups instead
+of unwinding slots arrays:
+
+    {
+        "user_id": ..., "task_id": ..., "title": ..., "description": ...,
+        "priority": ..., "status": ...,
+        "year": ..., "month": ..., "date": ..., "day_key": ...,
+        "time_slot": ..., "slot_index": ...,        # back-references to the slot
+        "day_id": ..., "day_updated_at": ...        # the calendar_data document synced from
+    }
+
+A task_id assigned to several slots has one document per slot.
+
+The sync runs after the calendar write has committed. If it fails, the day is
+marked in tasks_dirty ({"user_id", "day_key", "year", "month", "date",
+"marked_at"}) and `repair_dirty_tasks` re-syncs it from calendar_data before
+the user's tasks are next read.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import DeleteMany, InsertOne, UpdateOne
+
+from .slots import TASK_FIELDS, day_key, normalize_slot_dicts
+
+TASKS_COLLECTION = "tasks"
+TASKS_DIRTY_COLLECTION = "tasks_dirty"
+CALENDAR_COLLECTION = "calendar_data"
+
+
+def task_rows(
+    user_id: str,
+    year: int,
+    month: int,
+    date: int,
+    doc: Dict[str, Any],
+    updated_at: datetime
+) -> List[Dict[str, Any]]:
+    rows = []
+    for slot_index, slot in enumerate(normalize_slot_dicts(doc.get("slots", []))):
+        task = slot["task"]
+        if not task or not task.get("task_id"):
+            continue
+        rows.append({
+            "user_id": user_id,
+            **{field: task.get(field) for field in TASK_FIELDS},
+            "year": year,
+            "month": month,
+            "date": date,
+            "day_key": day_key(year, month, date),
+            "time_slot": slot["time_slot"],
+            "slot_index": slot_index,
+            "day_id": doc["_id"],
+            "day_updated_at": updated_at,
+        })
+    return rows
+
+
+async def sync_day_tasks(
+    db,
+    user_id: str,
+    year: int,
+    month: int,
+    date: int,
+    doc: Optional[Dict[str, Any]],
+    session=None
+) -> bool:
+    """
+    Replace the day's task documents with the tasks in `doc` (none if the day
+    was deleted). Skipped, returning False, if documents from a later write
+    to the day are already there. Pass a session to make the read and the
+    replacement one transaction.
+    """
+    collection = db[TASKS_COLLECTION]
+    key = day_key(year, month, date)
+    updated_at = (doc.get("updated_at") or datetime.utcnow()) if doc else datetime.utcnow()
+
+    newer = await collection.find_one(
+        {"user_id": user_id, "day_key": key, "day_updated_at": {"$gt": updated_at}},
+        {"_id": 1},
+        session=session
+    )
+    if newer:
+        return False
+
+    await collection.bulk_write(
+        day_task_operations(user_id, year, month, date, doc, updated_at),
+        ordered=True,
+        session=session
+    )
+    return True
+
+
+def day_task_operations(
+    user_id: str,
+    year: int,
+    month: int,
+    date: int,
+    doc: Optional[Dict[str, Any]],
+    updated_at: datetime
+) -> List[Any]:
+    """Bulk operations replacing one day's task documents"""
+    operations: List[Any] = [DeleteMany({"user_id": user_id, "day_key": day_key(year, month, date)})]
+    if doc:
+        operations.extend(InsertOne(row) for row in task_rows(user_id, year, month, date, doc, updated_at))
+    return operations
+
+
+async def sync_days_tasks(db, docs: List[Dict[str, Any]], session=None) -> int:
+    """
+    sync_day_tasks for many stored days at once: one query for days that
+    already have newer task documents, then one bulk write replacing the rest.
+    Returns the number of days synced.
+    """
+    if not docs:
+        return 0
+    collection = db[TASKS_COLLECTION]
+    now = datetime.utcnow()
+    updated = {
+        (doc["user_id"], day_key(doc["year"], doc["month"], doc["date"])): doc.get("updated_at") or now
+        for doc in docs
+    }
+    newer = set()
+    async for row in collection.find(
+        {"$or": [
+            {"user_id": user_id, "day_key": key, "day_updated_at": {"$gt": updated_at}}
+            for (user_id, key), updated_at in updated.items()
+        ]},
+        {"_id": 0, "user_id": 1, "day_key": 1},
+        session=session
+    ):
+        newer.add((row["user_id"], row["day_key"]))
+
+    operations = []
+    for doc in docs:
+        day = (doc["user_id"], day_key(doc["year"], doc["month"], doc["date"]))
+        if day not in newer:
+            operations.extend(day_task_operations(
+                doc["user_id"], doc["year"], doc["month"], doc["date"], doc, updated[day]
+            ))
+    if operations:
+        await collection.bulk_write(operations, ordered=True, session=session)
+    return len(docs) - len(newer)
+
+
+async def mark_tasks_dirty(db, user_id: str, days: List[Tuple[int, int, int]]) -> None:
+    """Record (year, month, date) days whose task documents could not be synced"""
+    await db[TASKS_DIRTY_COLLECTION].bulk_write([
+        UpdateOne(
+            {"user_id": user_id, "day_key": day_key(year, month, date)},
+            {
+                "$set": {"year": year, "month": month, "date": date},
+                "$currentDate": {"marked_at": True}
+            },
+            upsert=True
+        )
+        for year, month, date in days
+    ], ordered=False)
+
+
+async def repair_dirty_tasks(db, user_id: str) -> int:
+    """
+    Re-sync the user's days marked in tasks_dirty from calendar_data and clear
+    the marks. A day marked again while it is being repaired keeps its mark.
+    Returns the number of days repaired.
+    """
+    repaired = 0
+    async for mark in db[TASKS_DIRTY_COLLECTION].find({"user_id": user_id}):
+        year, month, date = mark["year"], mark["month"], mark["date"]
+        doc = await db[CALENDAR_COLLECTION].find_one(
+            {"user_id": user_id, "year": year, "month": month, "date": date}
+        )
+        await sync_day_tasks(db, user_id, year, month, date, doc)
+        await db[TASKS_DIRTY_COLLECTION].delete_one({"_id": mark["_id"], "marked_at": mark["marked_at"]})
+        repaired += 1
+    return repaired
+
+
+def task_response(row: Dict[str, Any], task_fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """A task document in the shape search results have always used"""
+    return {
+        "date": f"{row['year']}-{str(row['month']).zfill(2)}-{str(row['date']).zfill(2)}",
+        "time_slot": row["time_slot"],
+        "task": {field: row.get(field) for field in (task_fields or TASK_FIELDS)}
+    }
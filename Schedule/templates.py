@@ -0,0 +1,156 @@
+"""
+Weekly schedule templates bound to date ranges.
+
+Templates are the documents seeded into jee_weekly_schedules by insert_data.py
+({"category", "day", "description", "schedule": [{"time_slot", "activity", ...}]}).
+A binding subscribes a user to one template on some weekdays of a date range:
+
+    {
+        "user_id": ..., "template_id": ObjectId(...),
+        "start": "2025-08-01", "end": "2025-12-31",
+        "start_key": 20250801, "end_key": 20251231,   # slots.day_key of start and end
+        "weekdays": [0, 1, 2, 3, 4],                  # Monday is 0
+        "created_at": ...
+    }
+
+Bound days are not copied into calendar_data. Reads fill every day that has
+no stored document from the binding covering it, so a stored day is the
+override: writing a day replaces the template there, and deleting it falls
+back to the template again. Deleting with keep_empty=true stores the day with
+no slots instead, which clears it for good. Slot-level writes (adding slots, assigning or
+updating a task) store the template's slots first and then apply the change.
+
+A user's bindings never overlap on a weekday, so at most one applies to a day.
+"""
+import hashlib
+import json
+import re
+from datetime import date as Date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .intervals import slot_interval
+from .slots import SCHEMA_VERSION, day_key
+
+TEMPLATES_COLLECTION = "jee_weekly_schedules"
+BINDINGS_COLLECTION = "calendar_template_bindings"
+
+WEEKDAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+# Free-text placeholders in template fields that mean "nothing here"
+EMPTY_VALUES = {"", "-"}
+
+
+def template_weekdays(label: str) -> Optional[List[int]]:
+    """
+    Weekdays named by a template's "day" label, e.g. "Monday-Friday",
+    "Saturday" or "Saturday, Sunday"; None for labels such as "Exam Day".
+    """
+    weekdays: Set[int] = set()
+    for part in re.split(r"\s*(?:,|/|&|\band\b)\s*", label.strip().lower()):
+        names = [name.strip() for name in part.split("-")]
+        if not all(name in WEEKDAY_NAMES for name in names) or len(names) > 2:
+            return None
+        first, last = WEEKDAY_NAMES.index(names[0]), WEEKDAY_NAMES.index(names[-1])
+        weekdays.update((first + offset) % 7 for offset in range((last - first) % 7 + 1))
+    return sorted(weekdays) or None
+
+
+def template_slots(template: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """A template's schedule as stored slots, each activity a pending task"""
+    slots = []
+    for index, entry in enumerate(template.get("schedule", [])):
+        time_slot = entry.get("time_slot", "")
+        focus = (entry.get("subject_focus") or "").strip()
+        slots.append({
+            "time_slot": time_slot,
+            "task": {
+                "task_id": f"tpl-{template['_id']}-{index}",
+                "title": entry.get("activity", ""),
+                "description": None if focus in EMPTY_VALUES else focus,
+                "priority": "medium",
+                "status": "pending"
+            },
+            "interval": slot_interval(time_slot)
+        })
+    return slots
+
+
+def template_revision(template: Dict[str, Any]) -> str:
+    """Short hash of a template's schedule; changes whenever the template is edited"""
+    schedule = json.dumps(template.get("schedule", []), sort_keys=True, default=str)
+    return hashlib.sha1(schedule.encode()).hexdigest()[:12]
+
+
+def template_day(user_id: str, day: Date, binding: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    A bound day as it would be stored. It has no _id or version; `template`
+    identifies where it came from and feeds its ETag.
+    """
+    return {
+        "_id": None,
+        "user_id": user_id,
+        "year": day.year,
+        "month": day.month,
+        "date": day.day,
+        "day_key": day_key(day.year, day.month, day.day),
+        "slots": binding["slots"],
+        "schema_version": SCHEMA_VERSION,
+        "template": {
+            "template_id": binding["template_id"],
+            "binding_id": binding["_id"],
+            "revision": binding["revision"]
+        }
+    }
+
+
+def binding_for_day(bindings: Iterable[Dict[str, Any]], day: Date) -> Optional[Dict[str, Any]]:
+    key = day_key(day.year, day.month, day.day)
+    weekday = day.weekday()
+    for binding in bindings:
+        if binding["start_key"] <= key <= binding["end_key"] and weekday in binding["weekdays"]:
+            return binding
+    return None
+
+
+def template_days(
+    user_id: str,
+    bindings: Iterable[Dict[str, Any]],
+    first: Date,
+    last: Date,
+    stored_keys: Set[int]
+) -> List[Dict[str, Any]]:
+    """Bound days between first and last inclusive that have no stored document, in date order"""
+    days = []
+    first_key, last_key = day_key(first.year, first.month, first.day), day_key(last.year, last.month, last.day)
+    for binding in bindings:
+        if binding["end_key"] < first_key or binding["start_key"] > last_key:
+            continue
+        day = max(first, Date.fromisoformat(binding["start"]))
+        end = min(last, Date.fromisoformat(binding["end"]))
+        while day <= end:
+            if day.weekday() in binding["weekdays"] and day_key(day.year, day.month, day.day) not in stored_keys:
+                days.append(template_day(user_id, day, binding))
+            day += timedelta(days=1)
+    days.sort(key=lambda doc: doc["day_key"])
+    return days
+
+
+def project_slots(slots: List[Dict[str, Any]], task_fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Template slots cut down to the task fields a projected view asked for"""
+    if task_fields is None:
+        return slots
+    return [
+        {
+            **slot,
+            "task": {field: slot["task"][field] for field in task_fields if field in slot["task"]}
+            if slot.get("task") else None
+        }
+        for slot in slots
+    ]
+
+
+def bindings_overlap(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    return (
+        a["start_key"] <= b["end_key"]
+        and b["start_key"] <= a["end_key"]
+        and bool(set(a["weekdays"]) & set(b["weekdays"]))
+    )
@@ -20,9 +20,9 @@ app.add_middleware(
 )
 
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
     """Connect to MongoDB on startup"""
-    connect_to_mongo()
+    await connect_to_mongo()
 
 @app.on_event("shutdown")
 def shutdown_event():
@@ -0,0 +1,152 @@
+"""
+Seeded synthetic calendar data for the load benchmarks.
+
+The same seed, user count, day count and slots per day always produce the
+same documents, so two runs (or two commits) are measured against identical
+data. Documents are written in the stored format the API itself produces.
+
+    python -m benchmarks.dataset --users 100 --days 60 --slots-per-day 12 --seed 7
+"""
+import argparse
+import asyncio
+import os
+import random
+from datetime import date as Date, datetime, timedelta
+from typing import Any, Dict, Iterator, List
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from Schedule.intervals import MINUTES_PER_DAY, format_minutes
+from Schedule.migrations import CALENDAR_COLLECTION, MIGRATIONS_COLLECTION
+from Schedule.schema import ALLOWED_PRIORITIES, ALLOWED_STATUSES
+from Schedule.slots import SCHEMA_VERSION, day_key
+from Schedule.stats import STATS_COLLECTION, day_stats_update, record_days_stats
+from Schedule.tasks import TASKS_COLLECTION, sync_days_tasks
+
+USER_PREFIX = "bench_user_"
+FIRST_DAY = Date(2025, 8, 1)
+SLOT_MINUTES = 45
+DAY_STARTS_AT = 6 * 60
+SUBJECTS = ["Physics", "Chemistry", "Maths", "Biology", "English", "History"]
+ACTIVITIES = ["Revise", "Practice problems on", "Mock test:", "Read notes on", "Flashcards for", "Doubt session:"]
+TOPICS = ["mechanics", "optics", "organic reactions", "calculus", "algebra", "genetics", "thermodynamics", "vectors"]
+INSERT_BATCH_SIZE = 1000
+
+
+def user_ids(users: int) -> List[str]:
+    return [f"{USER_PREFIX}{index}" for index in range(users)]
+
+
+def slot_times(slots_per_day: int) -> List[str]:
+    """Back-to-back, non-overlapping slots from 06:00, as HH:MM-HH:MM"""
+    if DAY_STARTS_AT + slots_per_day * SLOT_MINUTES > MINUTES_PER_DAY:
+        raise ValueError(f"At most {(MINUTES_PER_DAY - DAY_STARTS_AT) // SLOT_MINUTES} slots fit in a day")
+    starts = [DAY_STARTS_AT + index * SLOT_MINUTES for index in range(slots_per_day)]
+    return [f"{format_minutes(start)}-{format_minutes(start + SLOT_MINUTES)}" for start in starts]
+
+
+def generate_days(
+    seed: int,
+    users: int,
+    days: int,
+    slots_per_day: int,
+    task_ratio: float = 0.6
+) -> Iterator[Dict[str, Any]]:
+    """calendar_data documents for every user and day, a task on task_ratio of the slots"""
+    rng = random.Random(seed)
+    now = datetime(2025, 7, 31)
+    times = slot_times(slots_per_day)
+    for user_id in user_ids(users):
+        for offset in range(days):
+            day = FIRST_DAY + timedelta(days=offset)
+            slots = []
+            for index, time_slot in enumerate(times):
+                task = None
+                if rng.random() < task_ratio:
+                    subject = rng.choice(SUBJECTS)
+                    task = {
+                        "task_id": f"task_{day_key(day.year, day.month, day.day)}_{index}",
+                        "title": f"{rng.choice(ACTIVITIES)} {subject} {rng.choice(TOPICS)}",
+                        "description": f"{subject} block {index + 1}",
+                        "priority": rng.choice(ALLOWED_PRIORITIES),
+                        "status": rng.choice(ALLOWED_STATUSES)
+                    }
+                start = DAY_STARTS_AT + index * SLOT_MINUTES
+                slots.append({
+                    "time_slot": time_slot,
+                    "task": task,
+                    "interval": {"start": start, "end": start + SLOT_MINUTES}
+                })
+            yield {
+                "user_id": user_id,
+                "year": day.year,
+                "month": day.month,
+                "date": day.day,
+                "day_key": day_key(day.year, day.month, day.day),
+                "slots": slots,
+                "schema_version": SCHEMA_VERSION,
+                "version": 1,
+                "created_at": now,
+                "updated_at": now
+            }
+
+
+async def seed_database(db, seed: int, users: int, days: int, slots_per_day: int) -> int:
+    """
+    Replace the benchmark users' days with generated ones, along with their
+    month stats and task documents. Other users' data is left alone. On a
+    database holding nothing but benchmark users the tasks backfill is marked
+    complete, so task search runs against the tasks collection as in a
+    migrated deployment. Returns the number of days written.
+    """
+    bench_users = {"user_id": {"$regex": f"^{USER_PREFIX}"}}
+    for name in (CALENDAR_COLLECTION, STATS_COLLECTION, TASKS_COLLECTION):
+        await db[name].delete_many(bench_users)
+    written = 0
+    batch = []
+    for doc in generate_days(seed, users, days, slots_per_day):
+        batch.append(doc)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            written += await insert_days(db, batch)
+            batch = []
+    if batch:
+        written += await insert_days(db, batch)
+    
+    others = await db[CALENDAR_COLLECTION].find_one({"user_id": {"$not": {"$regex": f"^{USER_PREFIX}"}}}, {"_id": 1})
+    if others is None:
+        await db[MIGRATIONS_COLLECTION].update_one(
+            {"_id": "tasks"},
+            {"$set": {"completed": True, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+    return written
+
+
+async def insert_days(db, docs: List[Dict[str, Any]]) -> int:
+    """Insert generated days and derive their month stats and task documents"""
+    await db[CALENDAR_COLLECTION].insert_many(docs, ordered=False)
+    await record_days_stats(db, [
+        day_stats_update(doc["user_id"], doc["year"], doc["month"], doc["date"], doc) for doc in docs
+    ])
+    await sync_days_tasks(db, docs)
+    return len(docs)
+
+
+async def main(args) -> None:
+    client = AsyncIOMotorClient(args.mongodb_url)
+    try:
+        written = await seed_database(client[args.database], args.seed, args.users, args.days, args.slots_per_day)
+        print(f"Seeded {written} days into {args.database}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed synthetic calendar data")
+    parser.add_argument("--mongodb-url", default=os.getenv("MONGODB_URL", "mongodb://127.0.0.1:27017"))
+    parser.add_argument("--database", default="calendar_bench")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--slots-per-day", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
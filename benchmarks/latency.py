@@ -0,0 +1,161 @@
+"""
+Concurrent latency benchmark for the calendar read endpoints.
+
+Run it against a live server before and after a change and compare the two
+result files:
+
+    python -m benchmarks.latency --base-url http://127.0.0.1:8000 --label sync --out sync.json
+    python -m benchmarks.latency --base-url http://127.0.0.1:8000 --label async --out async.json
+    python -m benchmarks.latency --compare sync.json async.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+# (method, path, JSON body or None)
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+COMPARED_METRICS = ("p50_ms", "p99_ms", "requests_per_sec")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies_ms: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    return {
+        "requests": len(latencies_ms) + errors,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(max(latencies_ms, default=0.0), 2),
+        "requests_per_sec": round(len(latencies_ms) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    make_request: Callable[[int], Request],
+    requests: int,
+    concurrency: int,
+    first: int = 0
+) -> Dict[str, Any]:
+    """
+    Send make_request(index) for indexes first..first+requests-1 from
+    `concurrency` workers; 4xx/5xx responses count as errors
+    """
+    latencies_ms: List[float] = []
+    errors = 0
+    remaining = iter(range(first, first + requests))
+
+    async def worker():
+        nonlocal errors
+        for index in remaining:
+            method, path, body = make_request(index)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                if response.status_code >= 400:
+                    errors += 1
+                    continue
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies_ms, errors, time.perf_counter() - start)
+
+
+def random_get(paths: List[str]) -> Callable[[int], Request]:
+    return lambda index: ("GET", random.choice(paths), None)
+
+
+async def run(args) -> Dict[str, Any]:
+    random.seed(args.seed)
+    user_ids = [f"{args.user_prefix}{i}" for i in range(args.users)]
+    day_paths = [
+        f"/calendar/slots/{user_id}/{args.year}/{args.month}/{day}"
+        for user_id in user_ids for day in range(1, 29)
+    ]
+    month_paths = [f"/calendar/month/{user_id}/{args.year}/{args.month}" for user_id in user_ids]
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30.0) as client:
+        results = {}
+        for name, paths in (("day_read", day_paths), ("month_read", month_paths)):
+            results[name] = await run_scenario(client, random_get(paths), args.requests, args.concurrency)
+            print(f"{name:<12} {results[name]}")
+    return {"label": args.label, "concurrency": args.concurrency, "scenarios": results}
+
+
+def compare(
+    before_path: str,
+    after_path: str,
+    metrics: Sequence[str] = COMPARED_METRICS,
+    max_regression: Optional[float] = None
+) -> List[str]:
+    """
+    Print both runs side by side. Returns the regressions beyond max_regression
+    percent (slower latencies other than p50, or fewer requests/sec) and any
+    increase in errors; nothing without max_regression.
+    """
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    regressions = []
+    print(f"{'scenario':<12} {'metric':<18} {before['label']:>12} {after['label']:>12} {'change':>9}")
+    for name, stats in before["scenarios"].items():
+        other = after["scenarios"].get(name)
+        if not other:
+            continue
+        for metric in metrics:
+            old, new = stats[metric], other[metric]
+            change = (new - old) / old * 100 if old else 0.0
+            print(f"{name:<12} {metric:<18} {old:>12} {new:>12} {change:>+8.1f}%")
+            worse = -change if metric == "requests_per_sec" else change
+            if max_regression is not None and metric != "p50_ms" and worse > max_regression:
+                regressions.append(f"{name} {metric} {change:+.1f}%")
+        if max_regression is not None and other["errors"] > stats["errors"]:
+            regressions.append(f"{name} errors {stats['errors']} -> {other['errors']}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calendar API latency benchmark")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--user-prefix", default="bench_user_")
+    parser.add_argument("--year", type=int, default=2025)
+    parser.add_argument("--month", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two result files")
+    parser.add_argument("--max-regression", type=float, help="With --compare, exit 1 if p99 or requests/sec regress by more than this percent")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare(*args.compare, max_regression=args.max_regression)
+        if regressions:
+            print("Regressions: " + "; ".join(regressions))
+            sys.exit(1)
+    else:
+        result = asyncio.run(run(args))
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(result, f, indent=2)
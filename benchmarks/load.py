@@ -0,0 +1,230 @@
+"""
+Reproducible load test for the calendar API.
+
+Seeds synthetic data (see dataset.py), then drives each scenario with a fixed
+number of requests at a fixed concurrency and reports p50/p95/p99 latency and
+requests/sec as JSON. Requests are drawn from a seeded generator, so two runs
+with the same arguments send the same requests against the same data.
+
+By default the app runs in-process against MongoDB at --mongodb-url (a local
+mongod). --in-memory uses mongomock-motor instead, which needs no server but
+measures the application side only; --base-url targets a running server,
+seeding the database named by --database, which should be the one the server
+was started with (DATABASE_NAME). Point both at a dedicated database: seeding
+replaces the bench_user_* data in it.
+
+    python -m benchmarks.load --in-memory --label main --out main.json
+    python -m benchmarks.load --mongodb-url mongodb://127.0.0.1:27017 --label branch --out branch.json
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 --mongodb-url mongodb://127.0.0.1:27017 --database calendar_bench
+    python -m benchmarks.load --compare main.json branch.json --max-regression 15
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import date as Date, timedelta
+from typing import Any, Dict
+from urllib.parse import quote
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from Schedule.indexes import ensure_indexes, require_indexes
+from Schedule.schema import ALLOWED_STATUSES
+
+from .dataset import FIRST_DAY, seed_database, slot_times, user_ids
+from .latency import Request, compare, run_scenario
+
+SCENARIOS = ["day_read", "month_read", "task_search", "create", "assign", "bulk_write"]
+# mongomock has no array filters, which task assignment relies on, and does not
+# evaluate the merge pipeline creates append slots with
+IN_MEMORY_UNSUPPORTED = {"assign", "create"}
+# Creates and bulk writes go to days far outside the seeded range, so they never overlap seeded slots
+CREATE_FIRST_DAY = Date(2030, 1, 1)
+BULK_FIRST_DAY = Date(2035, 1, 1)
+BULK_DAYS_PER_REQUEST = 7
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "requests_per_sec")
+
+
+class Workload:
+    """Deterministic request generators, one per scenario, over the seeded dataset"""
+
+    def __init__(self, seed: int, users: int, days: int, slots_per_day: int):
+        self.users = user_ids(users)
+        self.days = days
+        self.times = slot_times(slots_per_day)
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    def reset(self, scenario: str) -> None:
+        self.rng = random.Random(f"{self.seed}:{scenario}")
+
+    def _seeded_day(self) -> Date:
+        return FIRST_DAY + timedelta(days=self.rng.randrange(self.days))
+
+    def day_read(self, index: int) -> Request:
+        day = self._seeded_day()
+        return "GET", f"/calendar/slots/{self.rng.choice(self.users)}/{day.year}/{day.month}/{day.day}", None
+
+    def month_read(self, index: int) -> Request:
+        day = self._seeded_day()
+        return "GET", f"/calendar/month/{self.rng.choice(self.users)}/{day.year}/{day.month}", None
+
+    def task_search(self, index: int) -> Request:
+        status = self.rng.choice(ALLOWED_STATUSES)
+        return "GET", f"/calendar/tasks/{self.rng.choice(self.users)}?status={status}&page_size=50", None
+
+    def create(self, index: int) -> Request:
+        # Every request adds a distinct slot; a day fills up before the next one is used
+        user_id = self.users[index % len(self.users)]
+        position = index // len(self.users)
+        day = CREATE_FIRST_DAY + timedelta(days=position // len(self.times))
+        body = {"slots": [{"time_slot": self.times[position % len(self.times)], "task": None}]}
+        return "POST", f"/calendar/slots/{user_id}/{day.year}/{day.month}/{day.day}", body
+
+    def assign(self, index: int) -> Request:
+        day = self._seeded_day()
+        time_slot = quote(self.rng.choice(self.times), safe="")
+        body = {"task": {"task_id": f"bench_{index}", "title": f"Assigned task {index}", "priority": "high"}}
+        return "POST", f"/calendar/slots/{self.rng.choice(self.users)}/{day.year}/{day.month}/{day.day}/{time_slot}/task", body
+
+    def bulk_write(self, index: int) -> Request:
+        user_id = self.users[index % len(self.users)]
+        first = BULK_FIRST_DAY + timedelta(days=(index // len(self.users)) * BULK_DAYS_PER_REQUEST)
+        days = [
+            {
+                "date": (first + timedelta(days=offset)).isoformat(),
+                "slots": [{"time_slot": time_slot, "task": None} for time_slot in self.times[:4]]
+            }
+            for offset in range(BULK_DAYS_PER_REQUEST)
+        ]
+        return "POST", f"/calendar/slots/{user_id}/bulk", {"mode": "replace", "days": days}
+
+
+# The router is imported on first use so --compare runs without the API's dependencies
+def in_process_client(base_url: str = "http://bench") -> httpx.AsyncClient:
+    """
+    Client for an app serving only the calendar router. The full app also
+    mounts authentication, which needs production settings at import time;
+    attach_database supplies the database that startup would connect.
+    """
+    from fastapi import FastAPI
+    from Schedule.router import router
+
+    app = FastAPI()
+    app.include_router(router)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=base_url, timeout=60.0)
+
+
+async def attach_database(client, database_name: str, in_memory: bool):
+    """Point the in-process app at a database, as connect_to_mongo does on startup"""
+    from Schedule import router as calendar
+
+    calendar.mongodb.client = client
+    calendar.mongodb.database = client[database_name]
+    if not in_memory:
+        hello = await client.admin.command("hello")
+        calendar.mongodb.supports_transactions = bool(hello.get("setName") or hello.get("msg") == "isdbgrid")
+    await ensure_indexes(calendar.mongodb.database)
+    await require_indexes(calendar.mongodb.database)
+    return calendar.mongodb.database
+
+
+def mongo_client(args):
+    if not args.in_memory:
+        return AsyncIOMotorClient(args.mongodb_url)
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        sys.exit("--in-memory needs mongomock-motor: pip install mongomock-motor")
+    return AsyncMongoMockClient()
+
+
+async def run(args) -> Dict[str, Any]:
+    scenarios = args.scenarios or SCENARIOS
+    if args.in_memory:
+        skipped = [name for name in scenarios if name in IN_MEMORY_UNSUPPORTED]
+        if skipped:
+            print(f"Skipping {', '.join(skipped)}: not supported by the in-memory database")
+        scenarios = [name for name in scenarios if name not in IN_MEMORY_UNSUPPORTED]
+
+    if args.base_url and args.in_memory:
+        sys.exit("--in-memory runs the app in-process and cannot be combined with --base-url")
+    # A running server only needs the database for seeding
+    mongo = None if (args.base_url and args.no_seed) else mongo_client(args)
+    try:
+        if args.base_url:
+            database = mongo[args.database] if mongo is not None else None
+            client = httpx.AsyncClient(base_url=args.base_url, timeout=60.0)
+        else:
+            database = await attach_database(mongo, args.database, args.in_memory)
+            client = in_process_client()
+        if not args.no_seed:
+            started = time.perf_counter()
+            written = await seed_database(database, args.seed, args.users, args.days, args.slots_per_day)
+            print(f"Seeded {written} days in {time.perf_counter() - started:.1f}s")
+
+        workload = Workload(args.seed, args.users, args.days, args.slots_per_day)
+        results = {}
+        async with client:
+            for name in scenarios:
+                workload.reset(name)
+                make_request = getattr(workload, name)
+                if args.warmup:
+                    await run_scenario(client, make_request, args.warmup, args.concurrency)
+                results[name] = await run_scenario(
+                    client, make_request, args.requests, args.concurrency, first=args.warmup
+                )
+                print(f"{name:<12} {results[name]}")
+    finally:
+        if mongo is not None:
+            mongo.close()
+
+    return {
+        "label": args.label,
+        "target": args.base_url or ("in-memory" if args.in_memory else "mongod"),
+        "seed": args.seed,
+        "dataset": {"users": args.users, "days": args.days, "slots_per_day": args.slots_per_day},
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "python": platform.python_version(),
+        "scenarios": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calendar API load test")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the app in-process")
+    parser.add_argument("--mongodb-url", default=os.getenv("MONGODB_URL", "mongodb://127.0.0.1:27017"))
+    parser.add_argument("--database", default="calendar_bench")
+    parser.add_argument("--in-memory", action="store_true", help="Use mongomock-motor instead of a MongoDB server")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse the data already seeded")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--slots-per-day", type=int, default=12)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two result files")
+    parser.add_argument("--max-regression", type=float, help="With --compare, exit 1 if p95/p99 or requests/sec regress by more than this percent")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare(*args.compare, COMPARED_METRICS, args.max_regression)
+        if regressions:
+            print("Regressions: " + "; ".join(regressions))
+            sys.exit(1)
+    else:
+        result = asyncio.run(run(args))
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(result, f, indent=2)
@@ -0,0 +1,97 @@
+"""
+Per-slot serialization cost of a month view, old path versus fast path.
+
+The old path mirrors what get_month_calendar did before the fast read path:
+convert_legacy_slots, .dict(), MonthCalendarResponse validation and FastAPI's
+JSON encoding. The fast path is stored_slots plus FastJSONResponse.render.
+
+    python -m benchmarks.serialization --days 30 --slots-per-day 20
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from Schedule.responses import FastJSONResponse
+from Schedule.schema import MonthCalendarResponse
+from Schedule.slots import SCHEMA_VERSION, convert_legacy_slots, stored_slots
+
+
+def build_month(days: int, slots_per_day: int) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    documents = []
+    for date in range(1, days + 1):
+        slots = []
+        for index in range(slots_per_day):
+            hour, minute = divmod(index * 30, 60)
+            task = None
+            if index % 2 == 0:
+                task = {
+                    "task_id": f"task_{date}_{index}",
+                    "title": f"Study block {index}",
+                    "description": "Revise notes and solve practice problems",
+                    "priority": "high",
+                    "status": "pending",
+                }
+            slots.append({"time_slot": f"{hour:02d}:{minute:02d}-{hour:02d}:{minute + 29:02d}", "task": task})
+        documents.append({
+            "_id": ObjectId(),
+            "user_id": "bench_user",
+            "year": 2025,
+            "month": 8,
+            "date": date,
+            "slots": slots,
+            "schema_version": SCHEMA_VERSION,
+            "created_at": now,
+            "updated_at": now,
+        })
+    return documents
+
+
+def old_path(documents: List[Dict[str, Any]]) -> bytes:
+    month_data = []
+    for doc in documents:
+        slots = convert_legacy_slots(doc.get("slots", []))
+        month_data.append({**doc, "_id": str(doc["_id"]), "slots": [slot.dict() for slot in slots]})
+    response = MonthCalendarResponse(user_id="bench_user", year=2025, month=8, dates=month_data)
+    validated = MonthCalendarResponse.model_validate(response.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast_path(documents: List[Dict[str, Any]]) -> bytes:
+    content = {
+        "user_id": "bench_user",
+        "year": 2025,
+        "month": 8,
+        "dates": [{**doc, "_id": str(doc["_id"]), "slots": stored_slots(doc)} for doc in documents],
+    }
+    return FastJSONResponse(content).body
+
+
+def measure(fn: Callable[[List[Dict[str, Any]]], bytes], documents: List[Dict[str, Any]], rounds: int) -> float:
+    fn(documents)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(documents)
+    return (time.perf_counter() - start) / rounds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Month view serialization microbenchmark")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--slots-per-day", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    documents = build_month(args.days, args.slots_per_day)
+    total_slots = args.days * args.slots_per_day
+    results = {}
+    for name, fn in (("old", old_path), ("fast", fast_path)):
+        seconds = measure(fn, documents, args.rounds)
+        results[name] = seconds
+        print(f"{name:<5} {seconds * 1000:8.2f} ms/response  {seconds / total_slots * 1e6:6.2f} us/slot")
+    print(f"speedup {results['old'] / results['fast']:.1f}x over {total_slots} slots")
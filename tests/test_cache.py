@@ -0,0 +1,43 @@
+from Schedule.cache import MISSING, TTLCache
+
+
+def test_set_after_invalidating_the_same_key_is_dropped():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.set("a", 1, generation)
+    assert cache.get("a") is MISSING
+
+
+def test_invalidating_another_key_does_not_block_a_read():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate("b")
+    cache.set("a", 1, generation)
+    assert cache.get("a") == 1
+
+
+def test_read_started_after_the_invalidation_is_stored():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.invalidate("a")
+    cache.set("a", 1, cache.generation)
+    assert cache.get("a") == 1
+
+
+def test_forgotten_invalidations_still_block_older_reads():
+    cache = TTLCache(maxsize=2, ttl=60)
+    generation = cache.generation
+    for key in ("a", "b", "c"):
+        cache.invalidate(key)
+    cache.set("a", 1, generation)
+    assert cache.get("a") is MISSING
+    cache.set("d", 1, cache.generation)
+    assert cache.get("d") == 1
+
+
+def test_clear_blocks_reads_in_flight():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.clear()
+    cache.set("a", 1, generation)
+    assert cache.get("a") is MISSING
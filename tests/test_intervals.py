@@ -0,0 +1,114 @@
+import random
+
+import pytest
+
+from Schedule.intervals import (
+    MINUTES_PER_DAY, IntervalIndex, day_segments, find_overlaps, format_minutes,
+    free_gaps, merge_intervals, parse_time, parse_time_slot, slot_interval
+)
+
+
+@pytest.mark.parametrize("time_slot, expected", [
+    ("09:00-10:00", (540, 600)),
+    ("6:00 AM - 6:30 AM", (360, 390)),
+    ("9-10 AM", (540, 600)),
+    ("11:30 am to 12:15 pm", (690, 735)),
+    ("12:00 AM-1:00 AM", (0, 60)),
+    ("22:00-24:00", (1320, MINUTES_PER_DAY)),
+])
+def test_parse_time_slot(time_slot, expected):
+    assert parse_time_slot(time_slot) == expected
+
+
+def test_parse_time_slot_wraps_past_midnight():
+    assert parse_time_slot("11:00 PM-6:00 AM") == (1380, 1800)
+    assert parse_time_slot("23:30-00:30") == (1410, 1470)
+
+
+@pytest.mark.parametrize("time_slot", ["", "morning", "09:00", "10:00-10:00", "25:00-26:00", "09:75-10:00", "13 PM-2 PM"])
+def test_parse_time_slot_rejects_invalid(time_slot):
+    with pytest.raises(ValueError):
+        parse_time_slot(time_slot)
+
+
+def test_slot_interval():
+    assert slot_interval("09:00-10:00") == {"start": 540, "end": 600}
+    assert slot_interval("Exam day") is None
+
+
+def test_parse_time():
+    assert parse_time("14:30") == 870
+    assert parse_time("2:30 PM") == 870
+    with pytest.raises(ValueError):
+        parse_time("24:00")
+
+
+def test_index_overlapping_is_half_open():
+    index = IntervalIndex([(540, 600, "a"), (600, 660, "b"), (570, 630, "c")])
+    assert index.overlapping(590, 610) == ["a", "c", "b"]
+    assert index.overlapping(660, 700) == []
+    assert index.overlapping(500, 540) == []
+
+
+def test_index_matches_a_linear_scan():
+    rng = random.Random(7)
+    entries = []
+    for position in range(200):
+        start = rng.randrange(MINUTES_PER_DAY)
+        entries.append((start, start + rng.choice([15, 30, 60, 420, 900]), position))
+    index = IntervalIndex(entries)
+    for _ in range(300):
+        start = rng.randrange(MINUTES_PER_DAY)
+        end = start + rng.randrange(1, 240)
+        expected = {
+            position for entry_start, entry_end, position in entries
+            if any(entry_start < end + shift and entry_end > start + shift for shift in (-MINUTES_PER_DAY, 0, MINUTES_PER_DAY))
+        }
+        assert set(index.overlapping(start, end)) == expected
+
+
+def test_index_matches_wrapping_intervals_at_both_ends_of_the_day():
+    index = IntervalIndex.from_slots([{"time_slot": "23:00-01:00"}, "09:00-10:00"])
+    assert index.at(30) == [0]
+    assert index.at(1430) == [0]
+    assert index.at(570) == [1]
+    assert index.at(600) == []
+
+
+def test_index_from_slots_prefers_stored_interval_and_skips_unparseable():
+    index = IntervalIndex.from_slots([
+        {"time_slot": "not a time", "interval": {"start": 60, "end": 120}},
+        {"time_slot": "not a time either"},
+    ])
+    assert len(index) == 1
+    assert index.at(90) == [0]
+
+
+def test_find_overlaps():
+    assert find_overlaps(["09:00-10:00", "09:30-11:00", "12:00-13:00"]) == [("09:00-10:00", "09:30-11:00")]
+    assert find_overlaps(["23:00-01:00", "00:30-02:00"]) == [("23:00-01:00", "00:30-02:00")]
+    assert find_overlaps(["09:00-10:00", "10:00-11:00"]) == []
+
+
+def test_day_segments_carry_overnight_intervals_to_the_next_day():
+    assert day_segments(540, 600) == [(0, 540, 600)]
+    assert day_segments(1380, 1800) == [(0, 1380, MINUTES_PER_DAY), (1, 0, 360)]
+
+
+def test_merge_intervals():
+    assert merge_intervals([(20, 30), (0, 5), (5, 10), (25, 26)]) == [(0, 10), (20, 30)]
+    assert merge_intervals([]) == []
+
+
+def test_free_gaps():
+    busy = [(60, 120), (180, 240)]
+    assert free_gaps(busy, 0, 300) == [(0, 60), (120, 180), (240, 300)]
+    assert free_gaps(busy, 90, 200) == [(120, 180)]
+    assert free_gaps(busy, 0, 300, min_minutes=61) == []
+    assert free_gaps([], 0, MINUTES_PER_DAY) == [(0, MINUTES_PER_DAY)]
+
+
+def test_format_minutes():
+    assert format_minutes(0) == "00:00"
+    assert format_minutes(870) == "14:30"
+    assert format_minutes(MINUTES_PER_DAY) == "24:00"